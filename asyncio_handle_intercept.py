@@ -1,8 +1,12 @@
 import asyncio
+import random
+import time
 import typing
 
 AsyncIOHandle = typing.Union[asyncio.Handle, asyncio.TimerHandle]
 RunFunction = typing.Callable[[], None]
+# Returns whether the next handle should be intercepted
+Sampler = typing.Callable[[], bool]
 
 
 class _Handle(asyncio.Handle):
@@ -35,19 +39,106 @@ def _make_wrapped_handle(handle: AsyncIOHandle, run: RunFunction):
     assert False
 
 
+class EveryNthSampler:
+    def __init__(self, n: int):
+        assert n >= 1, "'n' must be at least 1"
+        self.n = n
+        self._countdown = 1
+
+    def __call__(self) -> bool:
+        self._countdown -= 1
+        if self._countdown:
+            return False
+        self._countdown = self.n
+        return True
+
+
+class RandomSampler:
+    def __init__(
+        self, rate: float, random_func: typing.Callable[[], float] = random.random
+    ):
+        assert 0 <= rate <= 1, "'rate' must be in [0, 1]"
+        self.rate = rate
+        self._random_func = random_func
+
+    def __call__(self) -> bool:
+        return self._random_func() < self.rate
+
+
+class AdaptiveSampler(EveryNthSampler):
+    # Every-Nth sampler adjusting N so that the time spent intercepting handles stays
+    # under 'overhead_budget', a fraction of wall time. N is re-evaluated every
+    # 'window' seconds: doubled when over budget, halved when under half the budget.
+    def __init__(
+        self,
+        overhead_budget: float,
+        *,
+        window: float = 1.0,
+        max_n: int = 1024,
+        clock: typing.Callable[[], float] = time.perf_counter
+    ):
+        super().__init__(1)
+        assert 0 < overhead_budget <= 1, "'overhead_budget' must be in (0, 1]"
+        assert max_n >= 1, "'max_n' must be at least 1"
+        self._overhead_budget = overhead_budget
+        self._window = window
+        self._max_n = max_n
+        self._clock = clock
+        self._window_start = clock()
+        self._window_overhead = 0.0
+
+    def record_overhead(self, duration: float):
+        self._window_overhead += duration
+        now = self._clock()
+        elapsed = now - self._window_start
+        if elapsed < self._window:
+            return
+        overhead = self._window_overhead / elapsed
+        if overhead > self._overhead_budget:
+            self.n = min(self.n * 2, self._max_n)
+        elif overhead < self._overhead_budget / 2:
+            self.n = max(self.n // 2, 1)
+        self._window_start = now
+        self._window_overhead = 0.0
+
+
 class HandleInterceptor:
     def __init__(
         self,
         *,
         # TODO: consider the implication of the intercepting functions raising
         pre_run: typing.Optional[RunFunction] = None,
-        post_run: typing.Optional[RunFunction] = None
+        post_run: typing.Optional[RunFunction] = None,
+        sampler: typing.Optional[Sampler] = None
     ):
         assert (
             pre_run is not None or post_run is not None
         ), "At least one of 'pre_run' or 'post_run' must be specified"
+        if isinstance(sampler, AdaptiveSampler):
+            self._intercept_handle = self._timed_intercept_handle
+            self._make_intercepted_run = self._make_timed_intercepted_run
+        elif sampler is not None:
+            self._intercept_handle = self.intercept_handle
         self._pre_run = pre_run
         self._post_run = post_run
+        self._sampler = sampler
+        if self._sampler is not None:
+            self.intercept_handle = self._intercept_sampled_handle
+
+    def _intercept_sampled_handle(self, handle: AsyncIOHandle) -> AsyncIOHandle:
+        # Handles that are not sampled are returned as is, without any wrapping
+        if not self._sampler():
+            return handle
+        return self._intercept_handle(handle)
+
+    def _timed_intercept_handle(self, handle: AsyncIOHandle) -> AsyncIOHandle:
+        clock = self._sampler._clock
+        start = clock()
+        try:
+            # 'intercept_handle' is rebound to the sampled variant on the instance
+            return type(self).intercept_handle(self, handle)
+        finally:
+            self._sampler.record_overhead(clock() - start)
 
     # TODO: typing should make it obvious that the interceptor does not change the type
     # of the handle (i.e no transition from asyncio.Handle to asyncio.TimerHandle and
@@ -96,3 +187,61 @@ class HandleInterceptor:
         if self._post_run is not None:
             return intercepted_run_post
         assert False
+
+    def _make_timed_intercepted_run(self, run_func: RunFunction):
+        # Same as '_make_intercepted_run', also timing the hooks for 'AdaptiveSampler'.
+        # Only the bare clock reads separating the hooks from the handle happen between
+        # 'pre_run' and 'post_run' (i.e. within the window they may be measuring), the
+        # bookkeeping is deferred until 'post_run' returns.
+        sampler = self._sampler
+        clock = sampler._clock
+
+        def intercepted_run_both():
+            start = clock()
+            try:
+                self._pre_run()
+            except:
+                sampler.record_overhead(clock() - start)
+                run_func()
+                return
+            overhead = clock() - start
+            try:
+                run_func()
+            finally:
+                start = clock()
+                try:
+                    self._post_run()
+                except:
+                    ...
+                sampler.record_overhead(overhead + clock() - start)
+
+        def intercepted_run_pre():
+            start = clock()
+            try:
+                self._pre_run()
+            except:
+                ...
+            overhead = clock() - start
+            try:
+                run_func()
+            finally:
+                sampler.record_overhead(overhead)
+
+        def intercepted_run_post():
+            try:
+                run_func()
+            finally:
+                start = clock()
+                try:
+                    self._post_run()
+                except:
+                    ...
+                sampler.record_overhead(clock() - start)
+
+        if self._pre_run is not None and self._post_run is not None:
+            return intercepted_run_both
+        if self._pre_run is not None:
+            return intercepted_run_pre
+        if self._post_run is not None:
+            return intercepted_run_post
+        assert False
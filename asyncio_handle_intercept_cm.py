@@ -1,21 +1,52 @@
 import asyncio
-import contextlib
+import sys
 import typing
 
 AsyncIOHandle = typing.Union[asyncio.Handle, asyncio.TimerHandle]
 RunFunction = typing.Callable[[], None]
 
 
+class InterceptContextManager(typing.Protocol):
+    # The same object is entered for every intercepted '_run', it must be reusable.
+    # - if '__enter__' raises, the handle is run without interception and '__exit__'
+    #   is not called
+    # - '__exit__' is called with the exception, if any, raised by '_run'. Its return
+    #   value is ignored: exceptions are never suppressed
+    # - exceptions raised by '__exit__' are ignored
+    def __enter__(self):
+        ...
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        ...
+
+
 class _Handle(asyncio.Handle):
     __slots__ = ("__base", "_intercept")
 
-    def __init__(self, base: asyncio.Handle, intercept):
+    def __init__(self, base: asyncio.Handle, intercept: InterceptContextManager):
         self.__base = base
         self._intercept = intercept
 
     def _run(self):
-        with self._intercept():
-            super()._run()
+        intercept = self._intercept
+        try:
+            intercept.__enter__()
+        except:
+            self.__base._run()
+            return
+        try:
+            self.__base._run()
+        except:
+            try:
+                intercept.__exit__(*sys.exc_info())
+            except:
+                ...
+            raise
+        else:
+            try:
+                intercept.__exit__(None, None, None)
+            except:
+                ...
 
     def __getattr__(self, item):
         return getattr(self.__base, item)
@@ -24,19 +55,36 @@ class _Handle(asyncio.Handle):
 class _TimerHandle(asyncio.TimerHandle):
     __slots__ = ("__base", "_intercept")
 
-    def __init__(self, base: asyncio.TimerHandle, intercept):
+    def __init__(self, base: asyncio.TimerHandle, intercept: InterceptContextManager):
         self.__base = base
         self._intercept = intercept
 
     def _run(self):
-        with self._intercept():
-            super()._run()
+        intercept = self._intercept
+        try:
+            intercept.__enter__()
+        except:
+            self.__base._run()
+            return
+        try:
+            self.__base._run()
+        except:
+            try:
+                intercept.__exit__(*sys.exc_info())
+            except:
+                ...
+            raise
+        else:
+            try:
+                intercept.__exit__(None, None, None)
+            except:
+                ...
 
     def __getattr__(self, item):
         return getattr(self.__base, item)
 
 
-def _make_wrapped_handle(handle: AsyncIOHandle, intercept):
+def _make_wrapped_handle(handle: AsyncIOHandle, intercept: InterceptContextManager):
     if isinstance(handle, asyncio.TimerHandle):
         return _TimerHandle(handle, intercept)
     if isinstance(handle, asyncio.Handle):
@@ -44,69 +92,80 @@ def _make_wrapped_handle(handle: AsyncIOHandle, intercept):
     assert False
 
 
+class _PreAndPostRun:
+    __slots__ = ("_pre_run", "_post_run")
+
+    def __init__(self, pre_run: RunFunction, post_run: RunFunction):
+        self._pre_run = pre_run
+        self._post_run = post_run
+
+    def __enter__(self):
+        self._pre_run()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._post_run()
+
+
+class _PreRun:
+    __slots__ = ("_pre_run",)
+
+    def __init__(self, pre_run: RunFunction):
+        self._pre_run = pre_run
+
+    def __enter__(self):
+        self._pre_run()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+
+class _PostRun:
+    __slots__ = ("_post_run",)
+
+    def __init__(self, post_run: RunFunction):
+        self._post_run = post_run
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._post_run()
+
+
 class HandleInterceptor:
     def __init__(
         self,
         *,
-        # TODO: consider changing the API to take a context manager instead, that way
-        # we run '_run' in the context of the passed context manager and exception
-        # handling is implied
         pre_run: typing.Optional[RunFunction] = None,
-        post_run: typing.Optional[RunFunction] = None
+        post_run: typing.Optional[RunFunction] = None,
+        context_manager: typing.Optional[InterceptContextManager] = None
     ):
         assert (
-            pre_run is not None or post_run is not None
-        ), "At least one of pre_run or post_run must be specified"
-        self._pre_run = pre_run
-        self._post_run = post_run
+            pre_run is not None or post_run is not None or context_manager is not None
+        ), "At least one of pre_run, post_run or context_manager must be specified"
+        assert context_manager is None or (
+            pre_run is None and post_run is None
+        ), "context_manager cannot be combined with pre_run or post_run"
+        self._intercept = (
+            self._make_intercept(pre_run, post_run)
+            if context_manager is None
+            else context_manager
+        )
 
     # TODO: typing should make it obvious that the interceptor does not change the type
     # of the handle (i.e no transition from asyncio.Handle to asyncio.TimerHandle and
     # vice-versa)
     def intercept_handle(self, handle: AsyncIOHandle) -> AsyncIOHandle:
-        intercept = self._make_intercept()
-        intercepted_handle = _make_wrapped_handle(handle, intercept)
-        return intercepted_handle
-
-    def _make_intercept(self):
-
-        # TODO: consider implications of intercept functions throwing
-        if self._pre_run is not None and self._post_run is not None:
-
-            @contextlib.contextmanager
-            def intercept():
-                try:
-                    self._pre_run()
-                except:
-                    yield
-                else:
-                    try:
-                        yield
-                    finally:
-                        self._post_run()
-
-            return intercept
-
-        if self._pre_run is not None:
-
-            @contextlib.contextmanager
-            def intercept():
-                try:
-                    self._pre_run()
-                except:
-                    pass  # TODO: implication of throwing here? See related TODO above
-                yield
-
-            return intercept
-
-        if self._post_run is not None:
-
-            @contextlib.contextmanager
-            def intercept():
-                try:
-                    yield
-                finally:
-                    self._post_run()
-
-            return intercept
+        return _make_wrapped_handle(handle, self._intercept)
+
+    @staticmethod
+    def _make_intercept(
+        pre_run: typing.Optional[RunFunction], post_run: typing.Optional[RunFunction]
+    ) -> InterceptContextManager:
+        if pre_run is not None and post_run is not None:
+            return _PreAndPostRun(pre_run, post_run)
+        if pre_run is not None:
+            return _PreRun(pre_run)
+        if post_run is not None:
+            return _PostRun(post_run)
         assert False
@@ -0,0 +1,182 @@
+import asyncio_handle_intercept
+import asyncio_handle_intercept_cm as intercept
+import asyncio
+import time
+import typing
+import pytest
+import logging
+
+
+def test_no_interceptor_is_error():
+    with pytest.raises(
+        AssertionError,
+        match="At least one of pre_run, post_run or context_manager must be specified",
+    ):
+        intercept.HandleInterceptor()
+
+
+def test_context_manager_and_run_functions_is_error():
+    with pytest.raises(
+        AssertionError,
+        match="context_manager cannot be combined with pre_run or post_run",
+    ):
+        intercept.HandleInterceptor(
+            pre_run=lambda: None, context_manager=_RecordingContextManager()
+        )
+
+
+class HandleFactory(typing.Protocol):
+    def __call__(
+        self, *args, **kwargs
+    ) -> typing.Union[asyncio.Handle, asyncio.TimerHandle]:
+        pass
+
+
+class _RecordingContextManager:
+    def __init__(self, raise_on_enter=False, raise_on_exit=False):
+        self._raise_on_enter = raise_on_enter
+        self._raise_on_exit = raise_on_exit
+        self.calls = []
+
+    def __enter__(self):
+        self.calls.append("enter")
+        if self._raise_on_enter:
+            raise RuntimeError("enter")
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.calls.append(("exit", exc_type))
+        if self._raise_on_exit:
+            raise RuntimeError("exit")
+        # Must not suppress the exception
+        return True
+
+
+def _handle_test_common(handle_factory: HandleFactory):
+    def test_pre_and_post_run():
+        calls = []
+        handle = handle_factory(calls.append, ["run"], asyncio.get_running_loop())
+        handle_interceptor = intercept.HandleInterceptor(
+            pre_run=lambda: calls.append("pre_run"),
+            post_run=lambda: calls.append("post_run"),
+        )
+        intercepted_handle = handle_interceptor.intercept_handle(handle)
+        assert type(intercepted_handle) is not type(handle)
+        assert isinstance(intercepted_handle, type(handle))
+        intercepted_handle._run()
+        intercepted_handle._run()
+        assert calls == ["pre_run", "run", "post_run"] * 2
+
+    test_pre_and_post_run()
+
+    def test_context_manager():
+        runs = []
+        context_manager = _RecordingContextManager()
+        handle_interceptor = intercept.HandleInterceptor(
+            context_manager=context_manager
+        )
+        handle = handle_factory(runs.append, [None], asyncio.get_running_loop())
+        handle_interceptor.intercept_handle(handle)._run()
+        assert runs == [None]
+        assert context_manager.calls == ["enter", ("exit", None)]
+
+    test_context_manager()
+
+    def test_context_manager_raising():
+        for raise_on_enter, raise_on_exit, expected_calls in (
+            (True, False, ["enter"]),
+            (False, True, ["enter", ("exit", None)]),
+        ):
+            runs = []
+            context_manager = _RecordingContextManager(raise_on_enter, raise_on_exit)
+            handle_interceptor = intercept.HandleInterceptor(
+                context_manager=context_manager
+            )
+            handle = handle_factory(runs.append, [None], asyncio.get_running_loop())
+            handle_interceptor.intercept_handle(handle)._run()
+            assert runs == [None]
+            assert context_manager.calls == expected_calls
+
+    test_context_manager_raising()
+
+    def test_run_raising():
+        def run_func():
+            # 'Handle._run' only lets these through
+            raise KeyboardInterrupt()
+
+        context_manager = _RecordingContextManager()
+        handle_interceptor = intercept.HandleInterceptor(
+            context_manager=context_manager
+        )
+        handle = handle_factory(run_func, [], asyncio.get_running_loop())
+        with pytest.raises(KeyboardInterrupt):
+            handle_interceptor.intercept_handle(handle)._run()
+        assert context_manager.calls == ["enter", ("exit", KeyboardInterrupt)]
+
+    test_run_raising()
+
+
+class _TimingContextManager:
+    __slots__ = ("start_ns",)
+
+    def __enter__(self):
+        self.start_ns = time.monotonic_ns()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        duration_ns = time.monotonic_ns() - self.start_ns
+
+
+def _handle_perf_test_call_run(handle_factory: HandleFactory):
+    def pre_run_func():
+        pre_run_ns = time.monotonic_ns()
+
+    def run_func():
+        run_ns = time.monotonic_ns()
+
+    def post_run_func():
+        post_run_ns = time.monotonic_ns()
+
+    ROUNDS = 100_000
+    for name, handle_interceptor in (
+        (
+            "closure",
+            asyncio_handle_intercept.HandleInterceptor(
+                pre_run=pre_run_func, post_run=post_run_func
+            ),
+        ),
+        (
+            "pre_run/post_run",
+            intercept.HandleInterceptor(pre_run=pre_run_func, post_run=post_run_func),
+        ),
+        (
+            "context manager",
+            intercept.HandleInterceptor(context_manager=_TimingContextManager()),
+        ),
+    ):
+        start = time.perf_counter()
+        for _ in range(ROUNDS):
+            handle = handle_factory(run_func, [], asyncio.get_running_loop())
+            handle_interceptor.intercept_handle(handle)._run()
+
+        logging.info(
+            "Time running %s rounds of %s intercepted creation and _run: %s (s)",
+            ROUNDS,
+            name,
+            time.perf_counter() - start,
+        )
+
+
+@pytest.mark.asyncio
+async def test_asyncio_handle():
+    _handle_test_common(asyncio.Handle)
+    _handle_perf_test_call_run(asyncio.Handle)
+
+
+@pytest.mark.asyncio
+async def test_asyncio_timer_handle():
+    # We use when = 0, because we do not run these via the event loop so we don't
+    # really care about the timing functionality.
+    timer_handle_factory = lambda *args, **kwargs: asyncio.TimerHandle(
+        0, *args, **kwargs
+    )
+    _handle_test_common(timer_handle_factory)
+    _handle_perf_test_call_run(timer_handle_factory)
@@ -199,3 +199,130 @@ async def test_asyncio_timer_handle():
     _handle_test_common(timer_handle_factory)
     _handle_perf_test_creation(timer_handle_factory)
     _handle_perf_test_call_run(timer_handle_factory)
+
+
+def test_every_nth_sampler():
+    sampler = intercept.EveryNthSampler(3)
+    assert [sampler() for _ in range(7)] == [
+        True,
+        False,
+        False,
+        True,
+        False,
+        False,
+        True,
+    ]
+
+
+def test_random_sampler():
+    values = iter([0.1, 0.5, 0.9])
+    sampler = intercept.RandomSampler(0.5, lambda: next(values))
+    assert [sampler() for _ in range(3)] == [True, False, False]
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_adaptive_sampler():
+    clock = _FakeClock()
+    sampler = intercept.AdaptiveSampler(0.1, window=1.0, max_n=4, clock=clock)
+    assert sampler.n == 1
+    for expected_n in (2, 4, 4):
+        # 20% overhead over the window
+        clock.now += 1.0
+        sampler.record_overhead(0.2)
+        assert sampler.n == expected_n
+    # Still within the window, no adjustment
+    sampler.record_overhead(10.0)
+    assert sampler.n == 4
+    for expected_n in (4, 2, 1, 1):
+        clock.now += 1.0
+        sampler.record_overhead(0.01)
+        assert sampler.n == expected_n
+
+
+@pytest.mark.asyncio
+async def test_sampled_interceptor():
+    runs = []
+    pre_runs = []
+    for sampler in (
+        intercept.EveryNthSampler(2),
+        intercept.AdaptiveSampler(1.0),
+    ):
+        handle_interceptor = intercept.HandleInterceptor(
+            pre_run=lambda: pre_runs.append(None), sampler=sampler
+        )
+        handles = [
+            asyncio.Handle(runs.append, [i], asyncio.get_running_loop())
+            for i in range(4)
+        ]
+        intercepted_handles = [
+            handle_interceptor.intercept_handle(handle) for handle in handles
+        ]
+        for intercepted_handle in intercepted_handles:
+            intercepted_handle._run()
+        if isinstance(sampler, intercept.AdaptiveSampler):
+            assert all(
+                intercepted is not handle
+                for handle, intercepted in zip(handles, intercepted_handles)
+            )
+            assert len(pre_runs) == 4
+        else:
+            # Unsampled handles are not wrapped
+            assert intercepted_handles[1] is handles[1]
+            assert intercepted_handles[3] is handles[3]
+            assert intercepted_handles[0] is not handles[0]
+            assert len(pre_runs) == 2
+        assert runs == [0, 1, 2, 3]
+        runs.clear()
+        pre_runs.clear()
+
+
+class _TickingClock:
+    # Advances by one on every read
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        self.now += 1
+        return self.now
+
+
+@pytest.mark.asyncio
+async def test_adaptive_sampler_does_not_inflate_durations():
+    clock = _TickingClock()
+    durations = []
+    overheads = []
+    start = None
+
+    def pre_run():
+        nonlocal start
+        start = clock()
+
+    def post_run():
+        nonlocal start
+        durations.append(clock() - start)
+        start = None
+
+    def record_overhead(duration):
+        # The sampler's bookkeeping happens outside of the measured window
+        assert start is None
+        overheads.append(duration)
+
+    sampler = intercept.AdaptiveSampler(1.0, clock=clock)
+    sampler.record_overhead = record_overhead
+    for interceptor_sampler in (None, sampler):
+        handle_interceptor = intercept.HandleInterceptor(
+            pre_run=pre_run, post_run=post_run, sampler=interceptor_sampler
+        )
+        handle = asyncio.Handle(lambda: None, [], asyncio.get_running_loop())
+        handle_interceptor.intercept_handle(handle)._run()
+    # Only the two bare clock reads separating the hooks from the handle land in the
+    # window, each hook is timed with two reads around it
+    assert durations == [1, 3]
+    assert overheads[-1] == 4
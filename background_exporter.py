@@ -0,0 +1,282 @@
+import array
+import asyncio
+import callsite_registry
+import logging
+import os
+import re
+import socket
+import threading
+import time
+import typing
+
+logger = logging.getLogger(__name__)
+
+# 'callsite_id' of events recorded without a handle
+UNKNOWN_CALL_SITE_ID = 0
+_UNKNOWN_CALL_SITE = callsite_registry.CallSite("<unknown>", "", 0)
+
+# (start_ns, duration_ns, callsite_id)
+Event = typing.Tuple[int, int, int]
+
+
+class EventRingBuffer:
+    # Single producer (the loop thread), single consumer (the exporter thread) ring
+    # buffer of events. Pushing never blocks: when the buffer is full the event is
+    # dropped and counted in 'dropped'.
+    # NOTE: relies on the GIL, each index is only ever written by one of the threads and
+    # the write index is published after the slot is filled.
+    def __init__(self, capacity: int = 65536):
+        assert capacity >= 1, "'capacity' must be at least 1"
+        self._capacity = capacity
+        self._starts = array.array("Q", bytes(8 * capacity))
+        self._durations = array.array("Q", bytes(8 * capacity))
+        self._call_site_ids = array.array("Q", bytes(8 * capacity))
+        # Total number of events pushed/popped, slots are 'index % capacity'
+        self._write_index = 0
+        self._read_index = 0
+        self.dropped = 0
+
+    def push(self, start: int, duration: int, call_site_id: int):
+        write_index = self._write_index
+        if write_index - self._read_index >= self._capacity:
+            self.dropped += 1
+            return
+        slot = write_index % self._capacity
+        self._starts[slot] = start
+        self._durations[slot] = duration
+        self._call_site_ids[slot] = call_site_id
+        self._write_index = write_index + 1
+
+    def __len__(self) -> int:
+        return self._write_index - self._read_index
+
+    def drain(self, max_events: typing.Optional[int] = None) -> typing.List[Event]:
+        read_index = self._read_index
+        end = self._write_index
+        if max_events is not None:
+            end = min(end, read_index + max_events)
+        events = []
+        for index in range(read_index, end):
+            slot = index % self._capacity
+            events.append(
+                (self._starts[slot], self._durations[slot], self._call_site_ids[slot])
+            )
+        self._read_index = end
+        return events
+
+
+class RingBufferTimeRecorder:
+    # Implements both 'timed_event_loop.AbstractTimeRecorder' and
+    # 'timed_event_loop.AbstractHandleTimeRecorder', recording raw events into an
+    # 'EventRingBuffer'. Call sites are only resolved when given the handle;
+    # 'call_sites' maps call site ids back to call sites.
+    def __init__(
+        self,
+        buffer: typing.Optional[EventRingBuffer] = None,
+        clock: typing.Callable[[], int] = time.monotonic_ns,
+        resolver: typing.Optional[callsite_registry.CallSiteResolver] = None,
+    ):
+        self.buffer = EventRingBuffer() if buffer is None else buffer
+        self._clock = clock
+        self._resolver = (
+            callsite_registry.CallSiteResolver() if resolver is None else resolver
+        )
+        self._call_site_ids: typing.Dict[callsite_registry.CallSite, int] = {}
+        self.call_sites: typing.List[callsite_registry.CallSite] = [_UNKNOWN_CALL_SITE]
+        self._curr_event_start = 0
+
+    def start_event(self):
+        self._curr_event_start = self._clock()
+
+    def end_event(self):
+        start = self._curr_event_start
+        self.buffer.push(start, self._clock() - start, UNKNOWN_CALL_SITE_ID)
+
+    def start_handle(self, handle: asyncio.Handle):
+        self._curr_event_start = self._clock()
+
+    def end_handle(self, handle: asyncio.Handle):
+        start = self._curr_event_start
+        duration = self._clock() - start
+        call_site, _ = self._resolver.resolve(handle)
+        call_site_id = self._call_site_ids.get(call_site)
+        if call_site_id is None:
+            call_site_id = self._call_site_ids[call_site] = len(self.call_sites)
+            self.call_sites.append(call_site)
+        self.buffer.push(start, duration, call_site_id)
+
+
+class AbstractExportSink(typing.Protocol):
+    def export(
+        self,
+        events: typing.List[Event],
+        call_sites: typing.Sequence[callsite_registry.CallSite],
+        dropped: int,
+    ):
+        ...
+
+
+def _metric_name(call_site: callsite_registry.CallSite) -> str:
+    return re.sub(r"[^A-Za-z0-9_.]", "_", call_site.name)
+
+
+class StatsdSink:
+    # Sends every event as a statsd timer ('<prefix>.<call site>:<ms>|ms') and the
+    # number of dropped events as a counter, batching lines into datagrams of at most
+    # 'max_datagram_size' bytes.
+    def __init__(
+        self,
+        address: typing.Tuple[str, int] = ("127.0.0.1", 8125),
+        prefix: str = "asyncio.handle",
+        max_datagram_size: int = 1432,
+    ):
+        self._address = address
+        self._prefix = prefix
+        self._max_datagram_size = max_datagram_size
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.setblocking(False)
+        self._reported_dropped = 0
+
+    def _send(self, datagram: bytes):
+        try:
+            self._socket.sendto(datagram, self._address)
+        except OSError:
+            # Best effort, like statsd itself
+            ...
+
+    def export(
+        self,
+        events: typing.List[Event],
+        call_sites: typing.Sequence[callsite_registry.CallSite],
+        dropped: int,
+    ):
+        lines = [
+            "{}.{}:{}|ms".format(
+                self._prefix, _metric_name(call_sites[call_site_id]), duration / 1e6
+            ).encode()
+            for _, duration, call_site_id in events
+        ]
+        if dropped > self._reported_dropped:
+            lines.append(
+                "{}.dropped:{}|c".format(
+                    self._prefix, dropped - self._reported_dropped
+                ).encode()
+            )
+            self._reported_dropped = dropped
+        datagram = b""
+        for line in lines:
+            if datagram and len(datagram) + 1 + len(line) > self._max_datagram_size:
+                self._send(datagram)
+                datagram = b""
+            datagram = line if not datagram else datagram + b"\n" + line
+        if datagram:
+            self._send(datagram)
+
+    def close(self):
+        self._socket.close()
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class OpenMetricsSink:
+    # Accumulates per call site counts and total durations and (atomically) rewrites
+    # 'path' with them in the OpenMetrics text format after every export, e.g. for the
+    # node exporter textfile collector.
+    def __init__(self, path: str, prefix: str = "asyncio_handle"):
+        self._path = path
+        self._prefix = prefix
+        # call site -> [count, total ns]
+        self._totals: typing.Dict[callsite_registry.CallSite, typing.List[int]] = {}
+        self._dropped = 0
+
+    def export(
+        self,
+        events: typing.List[Event],
+        call_sites: typing.Sequence[callsite_registry.CallSite],
+        dropped: int,
+    ):
+        for _, duration, call_site_id in events:
+            totals = self._totals.get(call_sites[call_site_id])
+            if totals is None:
+                totals = self._totals[call_sites[call_site_id]] = [0, 0]
+            totals[0] += 1
+            totals[1] += duration
+        self._dropped = dropped
+        tmp_path = self._path + ".tmp"
+        with open(tmp_path, "w") as output:
+            output.write(self.render())
+        os.replace(tmp_path, self._path)
+
+    def render(self) -> str:
+        prefix = self._prefix
+        lines = [
+            "# TYPE {}_duration_seconds summary".format(prefix),
+            "# UNIT {}_duration_seconds seconds".format(prefix),
+        ]
+        for call_site, (count, total) in self._totals.items():
+            labels = '{{callsite="{}",file="{}",line="{}"}}'.format(
+                _escape_label(call_site.name),
+                _escape_label(call_site.filename),
+                call_site.lineno,
+            )
+            lines.append("{}_duration_seconds_count{} {}".format(prefix, labels, count))
+            lines.append(
+                "{}_duration_seconds_sum{} {}".format(prefix, labels, total / 1e9)
+            )
+        lines.append("# TYPE {}_dropped counter".format(prefix))
+        lines.append("{}_dropped_total {}".format(prefix, self._dropped))
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+class BackgroundExporter:
+    # Daemon thread draining 'recorder.buffer' every 'interval' seconds, in batches of
+    # at most 'batch_size' events, into 'sink'. Only the exporter thread ever touches
+    # the sink.
+    def __init__(
+        self,
+        recorder: RingBufferTimeRecorder,
+        sink: AbstractExportSink,
+        *,
+        interval: float = 1.0,
+        batch_size: int = 8192
+    ):
+        self._recorder = recorder
+        self._sink = sink
+        self._interval = interval
+        self._batch_size = batch_size
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="asyncio-intercept-exporter", daemon=True
+        )
+
+    def start(self):
+        self._thread.start()
+
+    def _flush(self):
+        buffer = self._recorder.buffer
+        while True:
+            events = buffer.drain(self._batch_size)
+            if not events:
+                return
+            # A failing export only loses the batch it was given, the exporter keeps
+            # going
+            try:
+                self._sink.export(events, self._recorder.call_sites, buffer.dropped)
+            except Exception:
+                logger.exception("Failed to export events to %r", self._sink)
+
+    def _run(self):
+        while not self._stopped.wait(self._interval):
+            self._flush()
+        self._flush()
+
+    def close(self):
+        # Stops the exporter thread, after a final flush
+        self._stopped.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        else:
+            self._flush()
@@ -0,0 +1,129 @@
+import background_exporter
+import callsite_registry
+import socket
+import timed_event_loop
+
+
+def test_ring_buffer():
+    buffer = background_exporter.EventRingBuffer(capacity=3)
+    for i in range(5):
+        buffer.push(i, i * 10, i * 100)
+    assert buffer.dropped == 2
+    assert len(buffer) == 3
+    assert buffer.drain(2) == [(0, 0, 0), (1, 10, 100)]
+    buffer.push(5, 50, 500)
+    assert buffer.drain() == [(2, 20, 200), (5, 50, 500)]
+    assert buffer.drain() == []
+    assert buffer.dropped == 2
+
+
+def callback():
+    pass
+
+
+async def noop():
+    pass
+
+
+def _record_events():
+    recorder = background_exporter.RingBufferTimeRecorder()
+    loop = timed_event_loop.HandleTimedEventLoop(recorder)
+    try:
+        loop.call_soon(callback)
+        loop.call_soon(callback)
+        loop.run_until_complete(noop())
+    finally:
+        loop.close()
+    return recorder
+
+
+def test_ring_buffer_time_recorder():
+    recorder = _record_events()
+    events = recorder.buffer.drain()
+    call_sites = [recorder.call_sites[call_site_id] for _, _, call_site_id in events]
+    assert call_sites[:3] == [
+        callsite_registry.CallSite(
+            "callback", __file__, callback.__code__.co_firstlineno
+        )
+    ] * 2 + [callsite_registry.CallSite("noop", __file__, noop.__code__.co_firstlineno)]
+    assert all(duration >= 0 for _, duration, _ in events)
+
+    recorder = background_exporter.RingBufferTimeRecorder()
+    loop = timed_event_loop.InlineTimedEventLoop(recorder)
+    try:
+        loop.run_until_complete(noop())
+    finally:
+        loop.close()
+    assert {call_site_id for _, _, call_site_id in recorder.buffer.drain()} == {
+        background_exporter.UNKNOWN_CALL_SITE_ID
+    }
+
+
+def test_statsd_sink():
+    server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    server.bind(("127.0.0.1", 0))
+    server.settimeout(5)
+    sink = background_exporter.StatsdSink(
+        server.getsockname(), prefix="test", max_datagram_size=64
+    )
+    call_sites = [callsite_registry.CallSite("a<locals>.b", "", 0)]
+    try:
+        sink.export([(0, 1_500_000, 0)] * 3, call_sites, dropped=2)
+        lines = []
+        while len(lines) < 4:
+            lines.extend(server.recv(65536).decode().split("\n"))
+    finally:
+        sink.close()
+        server.close()
+    assert lines == ["test.a_locals_.b:1.5|ms"] * 3 + ["test.dropped:2|c"]
+
+
+def test_background_exporter_open_metrics(tmp_path):
+    path = str(tmp_path / "metrics.prom")
+    recorder = _record_events()
+    exporter = background_exporter.BackgroundExporter(
+        recorder,
+        background_exporter.OpenMetricsSink(path),
+        interval=0.01,
+        batch_size=1,
+    )
+    exporter.start()
+    exporter.close()
+    assert len(recorder.buffer) == 0
+    with open(path) as metrics:
+        lines = metrics.read().splitlines()
+    count_line = (
+        "asyncio_handle_duration_seconds_count"
+        '{{callsite="callback",file="{}",line="{}"}} 2'
+    ).format(__file__, callback.__code__.co_firstlineno)
+    assert count_line in lines
+    assert "asyncio_handle_dropped_total 0" in lines
+    assert lines[-1] == "# EOF"
+
+
+class _FailingSink:
+    def __init__(self, failures):
+        self.failures = failures
+        self.exported = []
+
+    def export(self, events, call_sites, dropped):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("export failed")
+        self.exported.extend(events)
+
+
+def test_background_exporter_failing_sink(caplog):
+    recorder = _record_events()
+    recorded = len(recorder.buffer)
+    sink = _FailingSink(1)
+    exporter = background_exporter.BackgroundExporter(
+        recorder, sink, interval=0.01, batch_size=1
+    )
+    exporter.start()
+    exporter.close()
+    # The first batch is lost, the exporter keeps going with the next ones
+    assert len(sink.exported) == recorded - 1
+    assert len(recorder.buffer) == 0
+    assert "Failed to export events" in caplog.text
+    assert "RuntimeError: export failed" in caplog.text
@@ -0,0 +1,130 @@
+import asyncio
+import collections
+import logging
+import sys
+import threading
+import time
+import traceback
+import typing
+
+
+class StuckCallback(typing.NamedTuple):
+    # repr of the handle, None if the recorder was not given it
+    handle: typing.Optional[str]
+    # How long (s) the callback had been running when the stack was captured
+    duration: float
+    stack: typing.List[str]
+
+
+def _log_stuck_callback(stuck_callback: StuckCallback):
+    logging.warning(
+        "Callback %s running for %.3f secs:\n%s",
+        stuck_callback.handle,
+        stuck_callback.duration,
+        "".join(stuck_callback.stack),
+    )
+
+
+class CallbackWatchdog:
+    # Implements both 'timed_event_loop.AbstractTimeRecorder' and
+    # 'timed_event_loop.AbstractHandleTimeRecorder'. The hooks only publish the
+    # callback being run and its start time, a watchdog thread checks them every
+    # 'check_interval' seconds and captures the stack of the loop thread when a callback
+    # has been running for more than 'threshold' seconds.
+    # Each stuck callback is captured at most once, at most one capture is made every
+    # 'min_report_interval' seconds, and only the last 'capacity' captures are kept in
+    # 'stuck_callbacks'. 'report' is called (from the watchdog thread) with every capture.
+    # 'loop_thread_id' defaults to the thread creating the watchdog.
+    def __init__(
+        self,
+        threshold: float,
+        *,
+        check_interval: typing.Optional[float] = None,
+        min_report_interval: float = 1.0,
+        capacity: int = 32,
+        report: typing.Optional[typing.Callable[[StuckCallback], None]] = None,
+        loop_thread_id: typing.Optional[int] = None,
+        clock: typing.Callable[[], float] = time.monotonic
+    ):
+        assert threshold > 0, "'threshold' must be positive"
+        self._threshold = threshold
+        self._check_interval = (
+            threshold / 4 if check_interval is None else check_interval
+        )
+        self._min_report_interval = min_report_interval
+        self.stuck_callbacks: typing.Deque[StuckCallback] = collections.deque(
+            maxlen=capacity
+        )
+        self._report = _log_stuck_callback if report is None else report
+        self._loop_thread_id = (
+            threading.get_ident() if loop_thread_id is None else loop_thread_id
+        )
+        self._clock = clock
+        # Shared slot: written by the loop thread, read by the watchdog thread.
+        # '_generation' changes with every callback, so the watchdog can tell whether
+        # '_start'/'_handle' belong together and whether it already captured them.
+        self._start: typing.Optional[float] = None
+        self._handle: typing.Optional[asyncio.Handle] = None
+        self._generation = 0
+        self._last_capture = -float("inf")
+        self._captured_generation = -1
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="asyncio-intercept-watchdog", daemon=True
+        )
+
+    def start_event(self):
+        self._generation += 1
+        self._start = self._clock()
+
+    def end_event(self):
+        self._start = None
+
+    def start_handle(self, handle: asyncio.Handle):
+        self._generation += 1
+        self._handle = handle
+        self._start = self._clock()
+
+    def end_handle(self, handle: asyncio.Handle):
+        self._start = None
+        self._handle = None
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread.is_alive():
+            self._thread.join()
+
+    def _run(self):
+        while not self._stopped.wait(self._check_interval):
+            self.check()
+
+    def check(self):
+        generation = self._generation
+        start = self._start
+        handle = self._handle
+        if start is None or generation == self._captured_generation:
+            return
+        now = self._clock()
+        duration = now - start
+        if duration < self._threshold:
+            return
+        if now - self._last_capture < self._min_report_interval:
+            return
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return
+        stack = traceback.format_stack(frame)
+        del frame
+        if generation != self._generation:
+            # The callback finished while capturing
+            return
+        self._captured_generation = generation
+        self._last_capture = now
+        stuck_callback = StuckCallback(
+            None if handle is None else repr(handle), duration, stack
+        )
+        self.stuck_callbacks.append(stuck_callback)
+        self._report(stuck_callback)
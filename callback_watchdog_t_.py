@@ -0,0 +1,75 @@
+import asyncio
+import callback_watchdog
+import pytest
+import time
+import timed_event_loop
+
+
+def stuck_callback(block_duration):
+    time.sleep(block_duration)
+
+
+async def run(block_durations):
+    loop = asyncio.get_running_loop()
+    for block_duration in block_durations:
+        loop.call_soon(stuck_callback, block_duration)
+    await asyncio.sleep(sum(block_durations))
+
+
+@pytest.mark.parametrize(
+    "loop_factory",
+    [timed_event_loop.InlineTimedEventLoop, timed_event_loop.HandleTimedEventLoop],
+)
+def test_stuck_callback_captured(loop_factory):
+    reports = []
+    watchdog = callback_watchdog.CallbackWatchdog(
+        0.05, check_interval=0.01, min_report_interval=0, report=reports.append
+    )
+    loop = loop_factory(watchdog)
+    watchdog.start()
+    try:
+        loop.run_until_complete(run([0.2, 0.01]))
+    finally:
+        watchdog.stop()
+        loop.close()
+    # Captured once, even though it was checked multiple times while stuck
+    assert len(reports) == 1
+    (stuck,) = watchdog.stuck_callbacks
+    assert stuck is reports[0]
+    assert stuck.duration >= 0.05
+    assert "stuck_callback" in stuck.stack[-1]
+    if loop_factory is timed_event_loop.HandleTimedEventLoop:
+        assert "stuck_callback" in stuck.handle
+    else:
+        assert stuck.handle is None
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_rate_limit_and_capacity():
+    clock = _FakeClock()
+    reports = []
+    watchdog = callback_watchdog.CallbackWatchdog(
+        1.0, min_report_interval=10.0, capacity=1, report=reports.append, clock=clock
+    )
+    for _ in range(4):
+        watchdog.start_event()
+        clock.now += 2.0
+        watchdog.check()
+        watchdog.end_event()
+        watchdog.check()
+        clock.now += 4.0
+    # Only every other stuck callback is captured, 6 seconds apart
+    assert len(reports) == 2
+    assert list(watchdog.stuck_callbacks) == reports[-1:]
+
+    watchdog.start_event()
+    clock.now += 0.5
+    watchdog.check()
+    assert len(reports) == 2
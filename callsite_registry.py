@@ -0,0 +1,169 @@
+import asyncio
+import functools
+import heapq
+import time
+import types
+import typing
+
+
+class CallSite(typing.NamedTuple):
+    name: str
+    filename: str
+    lineno: int
+
+
+class CallSiteStats(typing.NamedTuple):
+    call_site: CallSite
+    count: int
+    total: int
+    max: int
+    # Upper bound on how much of 'total' may belong to call sites that were evicted
+    # from the registry (see 'SlowCallbackRegistry')
+    error: int
+
+
+class SlowEvent(typing.NamedTuple):
+    duration: int
+    call_site: CallSite
+    task_name: typing.Optional[str]
+
+
+def _unwrap_callback(callback) -> typing.Tuple[typing.Hashable, typing.Any]:
+    # Returns the key identifying the code run by 'callback', and the 'asyncio.Task'
+    # owning it, if any
+    while isinstance(callback, functools.partial):
+        callback = callback.func
+    owner = getattr(callback, "__self__", None)
+    if isinstance(owner, asyncio.Task):
+        # 'Task.__step'/'Task.__wakeup', the code run is the task's coroutine
+        coro = owner.get_coro()
+        code = getattr(coro, "cr_code", None) or getattr(coro, "gi_code", None)
+        if code is not None:
+            return code, owner
+    code = getattr(getattr(callback, "__func__", callback), "__code__", None)
+    if code is not None:
+        return code, None
+    qualname = getattr(callback, "__qualname__", None)
+    if qualname is None:
+        # Callable instances, keyed on their type so that the registry does not grow
+        # with every instance
+        callback_type = type(callback)
+        code = getattr(getattr(callback_type, "__call__", None), "__code__", None)
+        if code is not None:
+            return code, None
+        return (None, callback_type.__qualname__), None
+    # Builtins and other callables without code, e.g. 'Future.set_result'
+    owner_type = None
+    if owner is not None and not isinstance(owner, types.ModuleType):
+        owner_type = type(owner)
+    return (owner_type, qualname), None
+
+
+def _make_call_site(key: typing.Hashable) -> CallSite:
+    if isinstance(key, tuple):
+        owner_type, qualname = key
+        if owner_type is not None and "." not in qualname:
+            qualname = "{}.{}".format(owner_type.__qualname__, qualname)
+        return CallSite(qualname, "<builtin>", 0)
+    return CallSite(
+        getattr(key, "co_qualname", key.co_name), key.co_filename, key.co_firstlineno
+    )
+
+
+class CallSiteResolver:
+    # Maps handles to the call site of their callback. Call sites are cached per code
+    # object, so resolving a handle is a few attribute lookups and a dict lookup.
+    def __init__(self):
+        self._call_sites: typing.Dict[typing.Hashable, CallSite] = {}
+
+    def resolve(
+        self, handle: asyncio.Handle
+    ) -> typing.Tuple[CallSite, typing.Optional[asyncio.Task]]:
+        key, task = _unwrap_callback(handle._callback)
+        call_site = self._call_sites.get(key)
+        if call_site is None:
+            call_site = self._call_sites[key] = _make_call_site(key)
+        return call_site, task
+
+
+class SlowCallbackRegistry:
+    # 'timed_event_loop.AbstractHandleTimeRecorder' keeping, in bounded memory:
+    # - the 'capacity' slowest events seen, with the name of the task they ran in
+    # - the 'capacity' most expensive call sites by total time, tracked with the
+    #   Space-Saving heavy hitters algorithm: when a new call site comes in while the
+    #   registry is full, it replaces the cheapest one and inherits its total as error.
+    def __init__(
+        self,
+        capacity: int = 32,
+        clock: typing.Callable[[], int] = time.perf_counter_ns,
+        resolver: typing.Optional[CallSiteResolver] = None,
+    ):
+        assert capacity >= 1, "'capacity' must be at least 1"
+        self._capacity = capacity
+        self._clock = clock
+        self._resolver = CallSiteResolver() if resolver is None else resolver
+        self._curr_event_start = 0
+        # call site -> [count, total, max, error]
+        self._stats: typing.Dict[CallSite, typing.List[int]] = {}
+        # min-heap of (duration, sequence number, call site, task name)
+        self._slowest: typing.List[
+            typing.Tuple[int, int, CallSite, typing.Optional[str]]
+        ] = []
+        self._sequence = 0
+
+    def start_handle(self, handle: asyncio.Handle):
+        self._curr_event_start = self._clock()
+
+    def end_handle(self, handle: asyncio.Handle):
+        duration = self._clock() - self._curr_event_start
+        call_site, task = self._resolver.resolve(handle)
+        self._record_call_site(call_site, duration)
+        slowest = self._slowest
+        if len(slowest) < self._capacity or duration > slowest[0][0]:
+            self._sequence += 1
+            task_name = None if task is None else task.get_name()
+            event = (duration, self._sequence, call_site, task_name)
+            if len(slowest) < self._capacity:
+                heapq.heappush(slowest, event)
+            else:
+                heapq.heapreplace(slowest, event)
+
+    def _record_call_site(self, call_site: CallSite, duration: int):
+        stats = self._stats.get(call_site)
+        if stats is not None:
+            stats[0] += 1
+            stats[1] += duration
+            if duration > stats[2]:
+                stats[2] = duration
+            return
+        if len(self._stats) < self._capacity:
+            self._stats[call_site] = [1, duration, duration, 0]
+            return
+        evicted = min(self._stats, key=lambda site: self._stats[site][1])
+        evicted_total = self._stats.pop(evicted)[1]
+        self._stats[call_site] = [
+            1,
+            evicted_total + duration,
+            duration,
+            evicted_total,
+        ]
+
+    def slowest(self) -> typing.List[SlowEvent]:
+        return [
+            SlowEvent(duration, call_site, task_name)
+            for duration, _, call_site, task_name in sorted(self._slowest, reverse=True)
+        ]
+
+    def most_expensive(self) -> typing.List[CallSiteStats]:
+        return sorted(
+            (
+                CallSiteStats(call_site, *stats)
+                for call_site, stats in self._stats.items()
+            ),
+            key=lambda stats: stats.total,
+            reverse=True,
+        )
+
+    def reset(self):
+        self._stats.clear()
+        self._slowest.clear()
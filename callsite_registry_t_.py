@@ -0,0 +1,117 @@
+import asyncio
+import callsite_registry
+import functools
+import time
+import timed_event_loop
+
+
+async def slow_coro(block_duration):
+    time.sleep(block_duration)
+
+
+async def fast_coro():
+    await asyncio.sleep(0)
+
+
+def plain_callback():
+    pass
+
+
+class CallableCallback:
+    def __call__(self):
+        pass
+
+
+class CallableBuiltinCallback(dict):
+    __call__ = dict.clear
+
+
+def test_resolve_call_sites():
+    resolver = callsite_registry.CallSiteResolver()
+
+    async def resolve_all():
+        loop = asyncio.get_running_loop()
+        task = asyncio.create_task(fast_coro(), name="fast")
+        task_site, owner = resolver.resolve(loop._ready[-1])
+        assert task_site.name == "fast_coro"
+        assert task_site.filename == __file__
+        assert owner is task
+        await task
+
+        handles = [
+            loop.call_soon(plain_callback),
+            loop.call_soon(functools.partial(plain_callback)),
+            loop.call_soon(print),
+        ]
+        sites = [resolver.resolve(handle) for handle in handles]
+        # Cached per code object
+        assert resolver.resolve(handles[0])[0] is sites[0][0]
+        for handle in handles:
+            handle.cancel()
+        assert sites[0] == sites[1]
+        assert sites[0][0].name == "plain_callback"
+        assert sites[0][1] is None
+        assert sites[2][0] == callsite_registry.CallSite("print", "<builtin>", 0)
+
+    asyncio.run(resolve_all())
+
+
+def test_resolve_callable_instances():
+    resolver = callsite_registry.CallSiteResolver()
+
+    async def resolve_all():
+        loop = asyncio.get_running_loop()
+        for callback_type, name in (
+            (CallableCallback, "CallableCallback.__call__"),
+            (CallableBuiltinCallback, "CallableBuiltinCallback"),
+        ):
+            handles = [loop.call_soon(callback_type()) for _ in range(2)]
+            sites = [resolver.resolve(handle)[0] for handle in handles]
+            for handle in handles:
+                handle.cancel()
+            # Instances share their type's call site
+            assert sites[0] is sites[1]
+            assert sites[0].name == name
+        assert len(resolver._call_sites) == 2
+
+    asyncio.run(resolve_all())
+
+
+def test_slow_callback_registry():
+    registry = callsite_registry.SlowCallbackRegistry(capacity=2)
+
+    async def run_all():
+        await asyncio.create_task(slow_coro(0.05), name="slow")
+        for _ in range(10):
+            await asyncio.create_task(fast_coro())
+
+    loop = timed_event_loop.HandleTimedEventLoop(registry)
+    try:
+        loop.run_until_complete(run_all())
+    finally:
+        loop.close()
+
+    slowest = registry.slowest()
+    assert len(slowest) == 2
+    assert slowest[0].call_site.name == "slow_coro"
+    assert slowest[0].task_name == "slow"
+    assert slowest[0].duration >= 50_000_000
+    assert slowest[0].duration >= slowest[1].duration
+
+    most_expensive = registry.most_expensive()
+    assert len(most_expensive) == 2
+    assert most_expensive[0].call_site.name == "slow_coro"
+    assert most_expensive[0].total >= most_expensive[1].total
+
+
+def test_heavy_hitters_eviction():
+    registry = callsite_registry.SlowCallbackRegistry(capacity=2)
+    sites = [callsite_registry.CallSite(name, "", 0) for name in "abc"]
+    registry._record_call_site(sites[0], 100)
+    registry._record_call_site(sites[1], 10)
+    registry._record_call_site(sites[2], 5)
+    stats = {stats.call_site: stats for stats in registry.most_expensive()}
+    assert set(stats) == {sites[0], sites[2]}
+    assert stats[sites[2]].total == 15
+    assert stats[sites[2]].error == 10
+    assert stats[sites[0]] == (sites[0], 1, 100, 100, 0)
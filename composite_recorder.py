@@ -0,0 +1,105 @@
+import asyncio
+import typing
+import timed_event_loop
+
+
+def _skip(end_hooks: typing.Tuple, failed: typing.List[int]) -> typing.Tuple:
+    # 'end_hooks' are in reverse order, 'failed' are indexes of start hooks
+    last = len(end_hooks) - 1
+    return tuple(
+        hook for index, hook in enumerate(end_hooks) if last - index not in failed
+    )
+
+
+class CompositeTimeRecorder:
+    # Dispatches 'start_event'/'end_event' to all 'recorders' from a single
+    # interception point. The hooks are flattened into tuples upfront; 'end_event'
+    # hooks are called in reverse order, so that recorders nest like context managers.
+    # A recorder raising does not prevent the other recorders from being called, but
+    # like with 'asyncio_handle_intercept.HandleInterceptor', the end hook of a
+    # recorder whose start hook raised is not called for that event.
+    def __init__(
+        self, recorders: typing.Iterable[timed_event_loop.AbstractTimeRecorder]
+    ):
+        recorders = list(recorders)
+        assert recorders, "At least one recorder must be specified"
+        self.recorders = recorders
+        self._start_events = tuple(recorder.start_event for recorder in recorders)
+        self._end_events = tuple(recorder.end_event for recorder in reversed(recorders))
+        # End hooks of the recorders whose start hook succeeded for the current event
+        self._curr_end_events: typing.Tuple[typing.Callable[[], None], ...] = ()
+
+    def start_event(self):
+        failed = None
+        for index, start_event in enumerate(self._start_events):
+            try:
+                start_event()
+            except:
+                if failed is None:
+                    failed = []
+                failed.append(index)
+        self._curr_end_events = (
+            self._end_events if failed is None else _skip(self._end_events, failed)
+        )
+
+    def end_event(self):
+        for end_event in self._curr_end_events:
+            try:
+                end_event()
+            except:
+                ...
+
+
+def _takes_handle(recorder: timed_event_loop.AnyTimeRecorder) -> bool:
+    return hasattr(recorder, "start_handle")
+
+
+class CompositeHandleTimeRecorder:
+    # Same as 'CompositeTimeRecorder', for 'timed_event_loop.HandleTimedEventLoop'.
+    # Both 'AbstractHandleTimeRecorder's and 'AbstractTimeRecorder's can be combined,
+    # only the former are given the handle.
+    def __init__(self, recorders: typing.Iterable[timed_event_loop.AnyTimeRecorder]):
+        recorders = list(recorders)
+        assert recorders, "At least one recorder must be specified"
+        self.recorders = recorders
+        self._start_hooks = tuple(
+            (recorder.start_handle, True)
+            if _takes_handle(recorder)
+            else (recorder.start_event, False)
+            for recorder in recorders
+        )
+        self._end_hooks = tuple(
+            (recorder.end_handle, True)
+            if _takes_handle(recorder)
+            else (recorder.end_event, False)
+            for recorder in reversed(recorders)
+        )
+        self._curr_end_hooks: typing.Tuple[
+            typing.Tuple[typing.Callable, bool], ...
+        ] = ()
+
+    def start_handle(self, handle: asyncio.Handle):
+        failed = None
+        for index, (start_hook, takes_handle) in enumerate(self._start_hooks):
+            try:
+                if takes_handle:
+                    start_hook(handle)
+                else:
+                    start_hook()
+            except:
+                if failed is None:
+                    failed = []
+                failed.append(index)
+        self._curr_end_hooks = (
+            self._end_hooks if failed is None else _skip(self._end_hooks, failed)
+        )
+
+    def end_handle(self, handle: asyncio.Handle):
+        for end_hook, takes_handle in self._curr_end_hooks:
+            try:
+                if takes_handle:
+                    end_hook(handle)
+                else:
+                    end_hook()
+            except:
+                ...
@@ -0,0 +1,94 @@
+import composite_recorder
+import pytest
+import timed_event_loop
+
+
+def test_no_recorder_is_error():
+    for composite in (
+        composite_recorder.CompositeTimeRecorder,
+        composite_recorder.CompositeHandleTimeRecorder,
+    ):
+        with pytest.raises(
+            AssertionError, match="At least one recorder must be specified"
+        ):
+            composite([])
+
+
+class _Recorder(timed_event_loop.AbstractTimeRecorder):
+    def __init__(self, name, calls, raising=False):
+        self._name = name
+        self._calls = calls
+        self._raising = raising
+
+    def start_event(self):
+        self._calls.append(("start", self._name))
+        if self._raising:
+            raise RuntimeError()
+
+    def end_event(self):
+        self._calls.append(("end", self._name))
+        if self._raising:
+            raise RuntimeError()
+
+
+class _HandleRecorder(timed_event_loop.AbstractHandleTimeRecorder):
+    def __init__(self, name, calls):
+        self._name = name
+        self._calls = calls
+
+    def start_handle(self, handle):
+        self._calls.append(("start", self._name, handle._callback))
+
+    def end_handle(self, handle):
+        self._calls.append(("end", self._name, handle._callback))
+
+
+async def noop():
+    pass
+
+
+def test_composite_time_recorder():
+    calls = []
+    composite = composite_recorder.CompositeTimeRecorder(
+        [
+            _Recorder("a", calls),
+            _Recorder("b", calls, raising=True),
+            _Recorder("c", calls),
+        ]
+    )
+    loop = timed_event_loop.InlineTimedEventLoop(composite)
+    try:
+        loop.run_until_complete(noop())
+    finally:
+        loop.close()
+    assert calls[:5] == [
+        ("start", "a"),
+        ("start", "b"),
+        ("start", "c"),
+        # No end for 'b', its start raised
+        ("end", "c"),
+        ("end", "a"),
+    ]
+
+
+def test_composite_handle_time_recorder():
+    calls = []
+    composite = composite_recorder.CompositeHandleTimeRecorder(
+        [_Recorder("a", calls), _HandleRecorder("b", calls)]
+    )
+
+    def callback():
+        pass
+
+    loop = timed_event_loop.HandleTimedEventLoop(composite)
+    try:
+        loop.call_soon(callback)
+        loop.run_until_complete(noop())
+    finally:
+        loop.close()
+    assert calls[:4] == [
+        ("start", "a"),
+        ("start", "b", callback),
+        ("end", "b", callback),
+        ("end", "a"),
+    ]
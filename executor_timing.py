@@ -0,0 +1,155 @@
+import asyncio
+import concurrent.futures
+import functools
+import latency_histogram
+import threading
+import time
+import typing
+import weakref
+
+
+class ExecutorSnapshot(typing.NamedTuple):
+    # Time (ns) calls waited in the executor's work queue before a worker picked them
+    # up, and ran for
+    queue_wait: latency_histogram.LatencyHistogram
+    execution: latency_histogram.LatencyHistogram
+    # Calls submitted and not started yet, running, and done
+    queued: int
+    busy: int
+    completed: int
+    # Most calls running at the same time
+    peak_busy: int
+    max_workers: typing.Optional[int]
+
+    def occupancy(self) -> typing.Optional[float]:
+        # Fraction of the workers busy
+        if not self.max_workers:
+            return None
+        return self.busy / self.max_workers
+
+
+class _QueuedCall:
+    __slots__ = ("submit_time", "dequeued")
+
+    def __init__(self, submit_time: int):
+        self.submit_time = submit_time
+        self.dequeued = False
+
+
+class ExecutorStats:
+    # Updated from the worker threads, hence the lock
+    def __init__(self, max_workers: typing.Optional[int] = None):
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._queue_wait = latency_histogram.LatencyHistogram()
+        self._execution = latency_histogram.LatencyHistogram()
+        self._queued = 0
+        self._busy = 0
+        self._completed = 0
+        self._peak_busy = 0
+
+    def _submitted(self) -> "_QueuedCall":
+        with self._lock:
+            self._queued += 1
+        return _QueuedCall(time.perf_counter_ns())
+
+    def _dequeue(self, call: "_QueuedCall"):
+        # Calls leave the queue either when a worker starts them, or when they are
+        # cancelled before (e.g. 'asyncio.wait_for' timing out), whichever comes first
+        with self._lock:
+            if not call.dequeued:
+                call.dequeued = True
+                self._queued -= 1
+
+    def _cancelled(self, call: "_QueuedCall", future: asyncio.Future):
+        if future.cancelled():
+            self._dequeue(call)
+
+    def _call(self, call: "_QueuedCall", func: typing.Callable, *args):
+        start = time.perf_counter_ns()
+        with self._lock:
+            if not call.dequeued:
+                call.dequeued = True
+                self._queued -= 1
+            self._busy += 1
+            if self._busy > self._peak_busy:
+                self._peak_busy = self._busy
+            self._queue_wait.record(start - call.submit_time)
+        try:
+            return func(*args)
+        finally:
+            end = time.perf_counter_ns()
+            with self._lock:
+                self._busy -= 1
+                self._completed += 1
+                self._execution.record(end - start)
+
+    def snapshot(self, reset: bool = False) -> ExecutorSnapshot:
+        # 'reset' only resets the histograms and 'peak_busy'
+        with self._lock:
+            snapshot = ExecutorSnapshot(
+                self._queue_wait.snapshot(reset),
+                self._execution.snapshot(reset),
+                self._queued,
+                self._busy,
+                self._completed,
+                self._peak_busy,
+                self.max_workers,
+            )
+            if reset:
+                self._peak_busy = self._busy
+            return snapshot
+
+
+class ExecutorTimingMixin:
+    # Records 'ExecutorStats' for the calls 'run_in_executor' submits to the default
+    # executor and to explicitly given 'concurrent.futures.ThreadPoolExecutor's, e.g.:
+    #   class Loop(ExecutorTimingMixin, timed_event_loop.TimedEventLoop): ...
+    # Other executors (e.g. process pools, which would need to pickle the timing
+    # wrapper) are used as is.
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.default_executor_stats = ExecutorStats()
+        # executor -> stats
+        self._executor_stats: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    def executor_stats(
+        self, executor: typing.Optional[concurrent.futures.Executor] = None
+    ) -> typing.Optional[ExecutorStats]:
+        if executor is None:
+            return self.default_executor_stats
+        return self._executor_stats.get(executor)
+
+    def run_in_executor(
+        self,
+        executor: typing.Optional[concurrent.futures.Executor],
+        func: typing.Callable,
+        *args
+    ) -> asyncio.Future:
+        if executor is None:
+            stats = self.default_executor_stats
+        elif isinstance(executor, concurrent.futures.ThreadPoolExecutor):
+            stats = self._executor_stats.get(executor)
+            if stats is None:
+                stats = self._executor_stats[executor] = ExecutorStats(
+                    executor._max_workers
+                )
+        else:
+            return super().run_in_executor(executor, func, *args)
+        if self._debug:
+            # Checked on 'func' itself rather than on the wrapper
+            self._check_callback(func, "run_in_executor")
+        # Counted before submitting, the call may start right away
+        call = stats._submitted()
+        try:
+            future = super().run_in_executor(
+                executor, functools.partial(stats._call, call, func), *args
+            )
+        except:
+            stats._dequeue(call)
+            raise
+        # Cancelling the future cancels the call too, unless it already started
+        future.add_done_callback(functools.partial(stats._cancelled, call))
+        if executor is None and self._default_executor is not None:
+            stats.max_workers = self._default_executor._max_workers
+        return future
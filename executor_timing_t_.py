@@ -0,0 +1,99 @@
+import asyncio
+import concurrent.futures
+import executor_timing
+import threading
+import time
+import timed_event_loop
+
+
+class _NullTimeRecorder(timed_event_loop.AbstractTimeRecorder):
+    def start_event(self):
+        pass
+
+    def end_event(self):
+        pass
+
+
+class _ExecutorTimingLoop(
+    executor_timing.ExecutorTimingMixin, timed_event_loop.TimedEventLoop
+):
+    pass
+
+
+_BLOCK_DURATION = 0.02
+
+
+def test_executor_timing():
+    started = threading.Event()
+    release = threading.Event()
+
+    def first():
+        started.set()
+        release.wait()
+        time.sleep(_BLOCK_DURATION)
+
+    async def run_all(executor):
+        loop = asyncio.get_running_loop()
+        futures = [loop.run_in_executor(executor, first)]
+        futures += [
+            loop.run_in_executor(executor, time.sleep, _BLOCK_DURATION)
+            for _ in range(2)
+        ]
+        await loop.run_in_executor(None, started.wait)
+        snapshot = loop.executor_stats(executor).snapshot()
+        assert (snapshot.queued, snapshot.busy, snapshot.completed) == (2, 1, 0)
+        assert snapshot.occupancy() == 1.0
+        release.set()
+        await asyncio.gather(*futures)
+
+    loop = _ExecutorTimingLoop(_NullTimeRecorder())
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+    try:
+        loop.run_until_complete(run_all(executor))
+    finally:
+        executor.shutdown()
+        loop.close()
+    snapshot = loop.executor_stats(executor).snapshot(reset=True)
+    assert (snapshot.queued, snapshot.busy, snapshot.completed) == (0, 0, 3)
+    assert snapshot.peak_busy == 1
+    assert snapshot.occupancy() == 0.0
+    assert snapshot.execution.count == 3
+    assert snapshot.execution.min >= _BLOCK_DURATION * 1e9
+    # The last call waited for the two others
+    assert snapshot.queue_wait.max >= 2 * _BLOCK_DURATION * 1e9
+    assert loop.executor_stats(executor).snapshot().execution.count == 0
+
+    default_snapshot = loop.executor_stats().snapshot()
+    assert default_snapshot.completed == 1
+    assert default_snapshot.max_workers is not None
+
+
+def test_cancelled_queued_call_leaves_queue():
+    release = threading.Event()
+    ran = []
+
+    async def run_all(executor):
+        loop = asyncio.get_running_loop()
+        blocking = loop.run_in_executor(executor, release.wait)
+        try:
+            await asyncio.wait_for(
+                loop.run_in_executor(executor, ran.append, None), 0.01
+            )
+        except asyncio.TimeoutError:
+            pass
+        await asyncio.sleep(0)
+        snapshot = loop.executor_stats(executor).snapshot()
+        assert (snapshot.queued, snapshot.busy) == (0, 1)
+        release.set()
+        await blocking
+
+    loop = _ExecutorTimingLoop(_NullTimeRecorder())
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+    try:
+        loop.run_until_complete(run_all(executor))
+    finally:
+        executor.shutdown()
+        loop.close()
+    snapshot = loop.executor_stats(executor).snapshot()
+    assert (snapshot.queued, snapshot.busy, snapshot.completed) == (0, 0, 1)
+    assert ran == []
@@ -0,0 +1,151 @@
+import asyncio
+import composite_recorder
+import heapq
+import itertools
+import task_accounting
+import time
+import timed_event_loop
+import typing
+import weakref
+
+
+class FairScheduler:
+    # 'timed_event_loop.AbstractHandleTimeRecorder' keeping, in the spirit of CFS:
+    # - a virtual clock, the total time (ns) spent running handles
+    # - a score per task, the time spent running its steps, decayed exponentially with
+    #   a 'half_life' (in seconds)
+    # Handles are keyed with the virtual time they become eligible at: the virtual
+    # clock when they are pushed, plus the score of their task. A task that ran for X ns
+    # recently thus waits for up to X ns of other work to run first, while handles not
+    # owned by a task (I/O callbacks, futures, ...) and light tasks go first.
+    def __init__(
+        self,
+        half_life: float = 1.0,
+        clock: typing.Callable[[], int] = time.perf_counter_ns,
+    ):
+        assert half_life > 0, "'half_life' must be positive"
+        self._half_life = half_life * 1e9
+        self._clock = clock
+        self.virtual_time = 0
+        # task -> [score, last update]
+        self._scores: "weakref.WeakKeyDictionary[asyncio.Task, typing.List[float]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._curr_event_start = 0
+        self._curr_running = False
+        self._curr_task: typing.Optional[asyncio.Task] = None
+
+    def _decayed_score(self, task: asyncio.Task, now: int) -> float:
+        entry = self._scores.get(task)
+        if entry is None:
+            return 0.0
+        score, last_update = entry
+        return score * 0.5 ** ((now - last_update) / self._half_life)
+
+    def score(self, task: asyncio.Task) -> float:
+        return self._decayed_score(task, self._clock())
+
+    def key(self, handle: asyncio.Handle) -> float:
+        # The handle running counts for what it ran so far, e.g. a task step pushing the
+        # next step is charged for itself already
+        now = self._clock()
+        elapsed = now - self._curr_event_start if self._curr_running else 0
+        task = task_accounting.owning_task(handle)
+        if task is None:
+            return self.virtual_time + elapsed
+        score = self._decayed_score(task, now)
+        if task is self._curr_task:
+            score += elapsed
+        return self.virtual_time + elapsed + score
+
+    def start_handle(self, handle: asyncio.Handle):
+        self._curr_task = task_accounting.owning_task(handle)
+        self._curr_running = True
+        self._curr_event_start = self._clock()
+
+    def end_handle(self, handle: asyncio.Handle):
+        now = self._clock()
+        duration = now - self._curr_event_start
+        self.virtual_time += duration
+        self._curr_running = False
+        task = self._curr_task
+        self._curr_task = None
+        if task is None:
+            return
+        entry = self._scores.get(task)
+        if entry is None:
+            self._scores[task] = [duration, now]
+            return
+        score, last_update = entry
+        entry[0] = score * 0.5 ** ((now - last_update) / self._half_life) + duration
+        entry[1] = now
+
+
+class FairReadyQueue:
+    # Drop-in replacement for the '_ready' deque of a loop, popping handles by the key
+    # given by 'scheduler' when they were pushed, in FIFO order for equal keys.
+    # Handles pushed by the handles run in an iteration may run in the same iteration,
+    # ahead of heavier handles which are left for the next one.
+    # NOTE: 'heapq' operations don't run any Python code (keys are unique thanks to the
+    # sequence number), so pushes from other threads are as safe as with a plain deque.
+    def __init__(self, scheduler: FairScheduler):
+        self._scheduler = scheduler
+        # (key, sequence number, handle)
+        self._heap: typing.List[typing.Tuple[float, int, asyncio.Handle]] = []
+        self._sequence = itertools.count()
+        # Decreasing, for 'appendleft'
+        self._left_sequence = itertools.count(-1, -1)
+
+    def _key(self, handle: asyncio.Handle) -> float:
+        try:
+            return self._scheduler.key(handle)
+        except:
+            return self._scheduler.virtual_time
+
+    def append(self, handle: asyncio.Handle):
+        heapq.heappush(self._heap, (self._key(handle), next(self._sequence), handle))
+
+    def appendleft(self, handle: asyncio.Handle):
+        heapq.heappush(
+            self._heap, (self._key(handle), next(self._left_sequence), handle)
+        )
+
+    def popleft(self) -> asyncio.Handle:
+        if not self._heap:
+            raise IndexError("pop from an empty deque")
+        return heapq.heappop(self._heap)[2]
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __iter__(self) -> typing.Iterator[asyncio.Handle]:
+        # In the order the handles would be popped
+        return (entry[2] for entry in sorted(self._heap))
+
+    def clear(self):
+        self._heap.clear()
+
+
+class FairSchedulingMixin(timed_event_loop.HandleTimedMixin):
+    # Reorders '_ready' with a 'FairScheduler', fed by the handle durations measured
+    # by 'timed_event_loop.HandleTimedMixin'. 'time_recorder' (if any) gets the same
+    # events as with 'timed_event_loop.HandleTimedEventLoop'.
+    def __init__(
+        self,
+        time_recorder: typing.Optional[timed_event_loop.AnyTimeRecorder] = None,
+        *args,
+        half_life: float = 1.0,
+        **kwargs
+    ):
+        self.fair_scheduler = FairScheduler(half_life)
+        recorder = self.fair_scheduler
+        if time_recorder is not None:
+            recorder = composite_recorder.CompositeHandleTimeRecorder(
+                [self.fair_scheduler, time_recorder]
+            )
+        super().__init__(recorder, *args, **kwargs)
+        self._ready = FairReadyQueue(self.fair_scheduler)
+
+
+class FairEventLoop(FairSchedulingMixin, asyncio.DefaultEventLoopPolicy._loop_factory):
+    pass
@@ -0,0 +1,106 @@
+import asyncio
+import fair_scheduling
+import iteration_stats
+import pytest
+import time
+import timed_event_loop
+
+
+class _CountingRecorder(timed_event_loop.AbstractHandleTimeRecorder):
+    def __init__(self):
+        self.handles = 0
+
+    def start_handle(self, handle):
+        pass
+
+    def end_handle(self, handle):
+        self.handles += 1
+
+
+async def _heavy(steps):
+    for _ in range(10):
+        steps.append("heavy")
+        time.sleep(0.005)
+        await asyncio.sleep(0)
+
+
+async def _light(steps):
+    for _ in range(10):
+        await asyncio.sleep(0)
+    steps.append("light done")
+
+
+async def _run_all(steps):
+    await asyncio.gather(_heavy(steps), *(_light(steps) for _ in range(5)))
+
+
+def test_fair_event_loop():
+    recorder = _CountingRecorder()
+    steps = []
+    loop = fair_scheduling.FairEventLoop(recorder)
+    try:
+        loop.run_until_complete(_run_all(steps))
+    finally:
+        loop.close()
+    assert steps.count("heavy") == 10
+    # The heavy task's first step runs before its score grows, then light tasks go first
+    assert steps[:1] == ["heavy"]
+    assert steps[1:6] == ["light done"] * 5
+    assert recorder.handles > 60
+    assert loop.fair_scheduler.virtual_time >= 10 * 0.005 * 1e9
+
+    # Whereas a FIFO '_ready' runs one step of every task per iteration
+    steps = []
+    loop = timed_event_loop.HandleTimedEventLoop(recorder)
+    try:
+        loop.run_until_complete(_run_all(steps))
+    finally:
+        loop.close()
+    assert steps.index("light done") >= 9
+
+
+class _StatsFairEventLoop(
+    iteration_stats.IterationStatsMixin, fair_scheduling.FairEventLoop
+):
+    pass
+
+
+def test_fair_scheduling_mixin_forwards_arguments():
+    stats = iteration_stats.IterationStats()
+    loop = _StatsFairEventLoop(
+        _CountingRecorder(),
+        half_life=2.0,
+        track_utilization=True,
+        iteration_stats=stats,
+    )
+    try:
+        loop.run_until_complete(_run_all([]))
+    finally:
+        loop.close()
+    assert loop.iteration_stats is stats
+    assert loop.utilization is not None
+    assert loop.utilization.snapshot().iterations > 0
+    assert loop.fair_scheduler._half_life == 2.0 * 1e9
+    assert loop.fair_scheduler.virtual_time > 0
+
+
+def test_fair_scheduler_score_decays():
+    now = [0]
+    scheduler = fair_scheduling.FairScheduler(half_life=1.0, clock=lambda: now[0])
+
+    async def step():
+        pass
+
+    async def run():
+        task = asyncio.ensure_future(step())
+        handle = asyncio.get_running_loop()._ready[-1]
+        scheduler.start_handle(handle)
+        now[0] += 1000
+        scheduler.end_handle(handle)
+        assert scheduler.score(task) == 1000
+        assert scheduler.key(handle) == 2000
+        now[0] += int(1e9)
+        assert scheduler.score(task) == pytest.approx(500)
+        await task
+
+    asyncio.run(run())
@@ -0,0 +1,73 @@
+import gc
+import latency_histogram
+import time
+import typing
+
+
+class GcPauseTracker:
+    # Measures garbage collector pauses through 'gc.callbacks' once installed: the
+    # cumulative pause time (ns), and every pause in 'histogram'. GC pauses stop the
+    # loop thread whatever thread triggered them, so all of them are counted.
+    def __init__(
+        self,
+        histogram: typing.Optional[latency_histogram.LatencyHistogram] = None,
+        clock: typing.Callable[[], int] = time.perf_counter_ns,
+    ):
+        self.histogram = (
+            latency_histogram.LatencyHistogram() if histogram is None else histogram
+        )
+        self._clock = clock
+        self.total = 0
+        self.collections = [0] * len(gc.get_count())
+        self._curr_pause_start = 0
+
+    def _callback(self, phase: str, info: typing.Dict[str, int]):
+        if phase == "start":
+            self._curr_pause_start = self._clock()
+            return
+        pause = self._clock() - self._curr_pause_start
+        self.total += pause
+        self.histogram.record(pause)
+        self.collections[info["generation"]] += 1
+
+    def install(self):
+        assert self._callback not in gc.callbacks, "Already installed"
+        gc.callbacks.append(self._callback)
+
+    def uninstall(self):
+        gc.callbacks.remove(self._callback)
+
+
+class GcSeparatingTimeRecorder(latency_histogram.HistogramTimeRecorder):
+    # 'latency_histogram.HistogramTimeRecorder' recording event durations minus the GC
+    # pauses that happened during the event, as measured by 'tracker' (which must be
+    # installed). How much GC time the last event had is kept in 'last_gc_time', e.g.
+    # for recorders combined after this one in a 'composite_recorder' to annotate
+    # their own events.
+    def __init__(
+        self,
+        tracker: GcPauseTracker,
+        histogram: typing.Optional[latency_histogram.LatencyHistogram] = None,
+        clock: typing.Callable[[], int] = time.perf_counter_ns,
+    ):
+        super().__init__(histogram, clock)
+        self._tracker = tracker
+        self._curr_event_gc_start = 0
+        self.last_gc_time = 0
+        # Events a GC pause happened in, and the GC time subtracted from them
+        self.gc_interrupted = 0
+        self.gc_time = 0
+
+    def start_event(self):
+        self._curr_event_gc_start = self._tracker.total
+        self._curr_event_start = self._clock()
+
+    def end_event(self):
+        duration = self._clock() - self._curr_event_start
+        gc_time = self._tracker.total - self._curr_event_gc_start
+        self.last_gc_time = gc_time
+        if gc_time:
+            self.gc_interrupted += 1
+            self.gc_time += gc_time
+            duration = max(duration - gc_time, 0)
+        self.histogram.record(duration)
@@ -0,0 +1,42 @@
+import gc
+import gc_pauses
+import time
+import timed_event_loop
+
+
+class _Cycle:
+    def __init__(self):
+        self.self = self
+
+
+def test_gc_separating_time_recorder():
+    tracker = gc_pauses.GcPauseTracker()
+    recorder = gc_pauses.GcSeparatingTimeRecorder(tracker)
+
+    def collect():
+        for _ in range(100_000):
+            _Cycle()
+        gc.collect()
+
+    def block():
+        time.sleep(0.01)
+
+    loop = timed_event_loop.InlineTimedEventLoop(recorder)
+    tracker.install()
+    try:
+        loop.call_soon(collect)
+        loop.call_soon(block)
+        loop.call_soon(loop.stop)
+        loop.run_forever()
+    finally:
+        tracker.uninstall()
+        loop.close()
+    assert tracker.collections[2] >= 1
+    assert tracker.histogram.count == sum(tracker.collections)
+    assert tracker.total >= recorder.gc_time > 0
+    assert recorder.gc_interrupted >= 1
+    # The GC pause is not accounted as handle time
+    assert recorder.histogram.max < 0.01 * 1e9 + recorder.gc_time
+    assert recorder.histogram.max >= 0.01 * 1e9
+    assert recorder.last_gc_time == 0
+    assert tracker._callback not in gc.callbacks
@@ -0,0 +1,62 @@
+import asyncio
+import asyncio_handle_intercept
+import collections
+import mapped_deque
+import timed_event_loop
+import typing
+
+
+def is_attached(loop: asyncio.BaseEventLoop) -> bool:
+    return isinstance(loop._ready, mapped_deque.MappedDeque)
+
+
+def _swap_ready(loop: asyncio.BaseEventLoop, new_ready: collections.deque):
+    old_ready = loop._ready
+    # Other threads (e.g. 'call_soon_threadsafe') look up '_ready' and then call
+    # 'append' on it, so they may still push to the old '_ready' after the swap. Pushes
+    # to it are forwarded to the new one, which only deque subclasses allow: pushes
+    # racing with a detach are forwarded, but pushes racing with an attach (swapping
+    # out a plain deque) may be lost, so it must not happen while other threads push
+    # to the loop.
+    if type(old_ready) is not collections.deque:
+        old_ready.append = new_ready.append
+        old_ready.appendleft = new_ready.appendleft
+    loop._ready = new_ready
+    # Handles queued before the swap must run first. The raw deque 'popleft' is used so
+    # that handles are moved without being mapped.
+    pending = []
+    while old_ready:
+        pending.append(collections.deque.popleft(old_ready))
+    new_ready.extendleft(reversed(pending))
+
+
+def attach_time_recorder(
+    loop: asyncio.BaseEventLoop,
+    time_recorder: timed_event_loop.AbstractTimeRecorder,
+    *,
+    sampler: typing.Optional[asyncio_handle_intercept.Sampler] = None
+):
+    # Starts timing the handles of an already created, possibly running, loop, the same
+    # way as 'timed_event_loop.TimedEventLoop'. Handles already queued are timed too.
+    # Must be called from the loop thread, e.g. from a callback or via
+    # 'loop.call_soon_threadsafe'. Attaching must not race with other threads pushing
+    # to the loop (see '_swap_ready').
+    assert not is_attached(loop), "A time recorder is already attached to the loop"
+    assert (
+        type(loop._ready) is collections.deque
+    ), "Only loops with a plain '_ready' deque are supported"
+    handle_interceptor = asyncio_handle_intercept.HandleInterceptor(
+        pre_run=time_recorder.start_event,
+        post_run=time_recorder.end_event,
+        sampler=sampler,
+    )
+    _swap_ready(
+        loop, mapped_deque.MappedDeque(mapping=handle_interceptor.intercept_handle)
+    )
+
+
+def detach_time_recorder(loop: asyncio.BaseEventLoop):
+    # Restores the plain '_ready' deque, after which the loop runs exactly as if it was
+    # never instrumented. Handles already queued are not timed anymore.
+    assert is_attached(loop), "No time recorder is attached to the loop"
+    _swap_ready(loop, collections.deque())
@@ -0,0 +1,87 @@
+import asyncio
+import collections
+import hot_instrumentation
+import pytest
+import run_once_loop
+
+
+class CountingTimeRecorder:
+    def __init__(self):
+        self.starts = 0
+        self.ends = 0
+
+    def start_event(self):
+        self.starts += 1
+
+    def end_event(self):
+        self.ends += 1
+
+
+@pytest.mark.parametrize(
+    "loop_factory",
+    [asyncio.DefaultEventLoopPolicy._loop_factory, run_once_loop.RunOnceEventLoop],
+)
+def test_attach_detach_running_loop(loop_factory):
+    recorder = CountingTimeRecorder()
+    order = []
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        # Queued before attaching, so these run in the same loop iteration as the
+        # callback attaching
+        loop.call_soon(hot_instrumentation.attach_time_recorder, loop, recorder)
+        for i in range(3):
+            loop.call_soon(order.append, i)
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert hot_instrumentation.is_attached(loop)
+        attached_starts = recorder.starts
+        assert attached_starts >= 3
+
+        loop.call_soon(order.append, 3)
+        hot_instrumentation.detach_time_recorder(loop)
+        assert type(loop._ready) is collections.deque
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        # The handle running when detaching was already being timed
+        assert recorder.starts == attached_starts
+
+    loop = loop_factory()
+    try:
+        loop.run_until_complete(run())
+    finally:
+        loop.close()
+    assert order == [0, 1, 2, 3]
+    assert recorder.starts == recorder.ends
+
+
+def test_attach_errors():
+    loop = asyncio.DefaultEventLoopPolicy._loop_factory()
+    try:
+        with pytest.raises(AssertionError, match="No time recorder is attached"):
+            hot_instrumentation.detach_time_recorder(loop)
+        hot_instrumentation.attach_time_recorder(loop, CountingTimeRecorder())
+        with pytest.raises(AssertionError, match="already attached"):
+            hot_instrumentation.attach_time_recorder(loop, CountingTimeRecorder())
+    finally:
+        loop.close()
+
+
+def test_swapped_out_ready_forwards_pushes():
+    loop = asyncio.DefaultEventLoopPolicy._loop_factory()
+    try:
+        hot_instrumentation.attach_time_recorder(loop, CountingTimeRecorder())
+        # As if another thread looked up '_ready' right before the swap
+        stale_ready = loop._ready
+        hot_instrumentation.detach_time_recorder(loop)
+        assert type(loop._ready) is collections.deque
+        handle = asyncio.Handle(print, (), loop)
+        stale_ready.append(handle)
+        assert not stale_ready
+        assert list(loop._ready) == [handle]
+        loop._ready.clear()
+        # Plain deques can be attached to again
+        hot_instrumentation.attach_time_recorder(loop, CountingTimeRecorder())
+        assert hot_instrumentation.is_attached(loop)
+    finally:
+        loop.close()
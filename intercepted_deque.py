@@ -1,33 +1,74 @@
 import collections
+import functools
 import typing
 
 _T = typing.TypeVar("_T")
 
 
 Interceptor = typing.Callable[[], None]
+# Called once per bulk operation with the number of items pushed/popped
+BulkInterceptor = typing.Callable[[int], None]
+
+
+def _noop():
+    ...
+
+
+def _repeat(interceptor: Interceptor) -> BulkInterceptor:
+    def bulk_interceptor(count: int):
+        for _ in range(count):
+            interceptor()
+
+    return bulk_interceptor
 
 
 class InterceptedDeque(collections.deque):
+    # Bulk operations call the bulk interceptors once with the number of items
+    # affected, falling back to calling the per item interceptors that many times.
+    # Items dropped because of 'maxlen' count as popped, 'rotate(n)' counts as popping
+    # and pushing the rotated items, the same as 'appendleft(pop())' repeated.
     def __init__(
         self,
         iterable: typing.Optional[typing.Iterable[_T]] = None,
         maxlen: typing.Optional[int] = None,
         push_interceptor: typing.Optional[Interceptor] = None,
         pop_interceptor: typing.Optional[Interceptor] = None,
+        bulk_push_interceptor: typing.Optional[BulkInterceptor] = None,
+        bulk_pop_interceptor: typing.Optional[BulkInterceptor] = None,
     ):
         iterable = [] if iterable is None else iterable
         super().__init__(iterable, maxlen)
         assert (
-            push_interceptor is not None or pop_interceptor is not None
-        ), "At least one of 'push_interceptor' or 'pop_interceptor' must be specified"
+            push_interceptor is not None
+            or pop_interceptor is not None
+            or bulk_push_interceptor is not None
+            or bulk_pop_interceptor is not None
+        ), "At least one push or pop interceptor must be specified"
+        if push_interceptor is None and bulk_push_interceptor is not None:
+            push_interceptor = functools.partial(bulk_push_interceptor, 1)
+        if bulk_push_interceptor is None and push_interceptor is not None:
+            bulk_push_interceptor = _repeat(push_interceptor)
+        if pop_interceptor is None and bulk_pop_interceptor is not None:
+            pop_interceptor = functools.partial(bulk_pop_interceptor, 1)
+        if bulk_pop_interceptor is None and pop_interceptor is not None:
+            bulk_pop_interceptor = _repeat(pop_interceptor)
         self._push_interceptor = push_interceptor
         self._pop_interceptor = pop_interceptor
+        self._bulk_push_interceptor = bulk_push_interceptor
+        self._bulk_pop_interceptor = bulk_pop_interceptor
         if self._pop_interceptor is None:
             self.pop = super().pop
             self.popleft = super().popleft
-        if self._push_interceptor is None:
+        if maxlen is not None and self._pop_interceptor is not None:
+            # Items dropped by pushes must be reported as popped
+            if self._push_interceptor is None:
+                self._push_interceptor = _noop
+        elif self._push_interceptor is None:
             self.append = super().append
             self.appendleft = super().appendleft
+        else:
+            self.append = self._append
+            self.appendleft = self._appendleft
 
     def pop(self) -> _T:
         ret = super().pop()
@@ -39,10 +80,126 @@ class InterceptedDeque(collections.deque):
         self._pop_interceptor()
         return ret
 
+    def _append(self, x: _T):
+        self._push_interceptor()
+        super().append(x)
+
+    def _appendleft(self, x: _T):
+        self._push_interceptor()
+        super().appendleft(x)
+
     def append(self, x: _T):
         self._push_interceptor()
+        if len(self) == self.maxlen:
+            self._pop_interceptor()
         super().append(x)
 
     def appendleft(self, x: _T):
         self._push_interceptor()
+        if len(self) == self.maxlen:
+            self._pop_interceptor()
         super().appendleft(x)
+
+    def _intercept_resize(self, pushed: int, old_len: int):
+        if pushed and self._bulk_push_interceptor is not None:
+            self._bulk_push_interceptor(pushed)
+        dropped = old_len + pushed - len(self)
+        if dropped and self._bulk_pop_interceptor is not None:
+            self._bulk_pop_interceptor(dropped)
+
+    def extend(self, iterable: typing.Iterable[_T]):
+        items = list(iterable)
+        old_len = len(self)
+        super().extend(items)
+        self._intercept_resize(len(items), old_len)
+
+    def extendleft(self, iterable: typing.Iterable[_T]):
+        items = list(iterable)
+        old_len = len(self)
+        super().extendleft(items)
+        self._intercept_resize(len(items), old_len)
+
+    def __iadd__(self, iterable: typing.Iterable[_T]) -> "InterceptedDeque":
+        self.extend(iterable)
+        return self
+
+    def __imul__(self, n: int) -> "InterceptedDeque":
+        old_len = len(self)
+        super().__imul__(n)
+        self._intercept_resize(old_len * (n - 1) if n > 0 else 0, old_len)
+        return self
+
+    def insert(self, i: int, x: _T):
+        super().insert(i, x)
+        if self._bulk_push_interceptor is not None:
+            self._bulk_push_interceptor(1)
+
+    def remove(self, value: _T):
+        super().remove(value)
+        if self._bulk_pop_interceptor is not None:
+            self._bulk_pop_interceptor(1)
+
+    def __delitem__(self, i: int):
+        super().__delitem__(i)
+        if self._bulk_pop_interceptor is not None:
+            self._bulk_pop_interceptor(1)
+
+    def clear(self):
+        count = len(self)
+        super().clear()
+        if count and self._bulk_pop_interceptor is not None:
+            self._bulk_pop_interceptor(count)
+
+    def rotate(self, n: int = 1):
+        super().rotate(n)
+        count = abs(n) % len(self) if len(self) else 0
+        if not count:
+            return
+        if self._bulk_pop_interceptor is not None:
+            self._bulk_pop_interceptor(count)
+        if self._bulk_push_interceptor is not None:
+            self._bulk_push_interceptor(count)
+
+
+class DepthTracker:
+    # Number of items in a deque and the highest it got to since the last
+    # 'reset_high_watermark()', maintained in O(1) per (bulk) operation.
+    def __init__(self, depth: int = 0):
+        self.depth = depth
+        self.high_watermark = depth
+
+    def push(self, count: int = 1):
+        depth = self.depth + count
+        self.depth = depth
+        if depth > self.high_watermark:
+            self.high_watermark = depth
+
+    def pop(self, count: int = 1):
+        self.depth -= count
+
+    def reset_high_watermark(self) -> int:
+        # Returns the high watermark of the period that just ended
+        high_watermark = self.high_watermark
+        self.high_watermark = self.depth
+        return high_watermark
+
+
+class DepthTrackedDeque(InterceptedDeque):
+    # e.g. 'loop._ready = DepthTrackedDeque(loop._ready)' to monitor the depth of the
+    # ready queue through 'depth_tracker'.
+    def __init__(
+        self,
+        iterable: typing.Optional[typing.Iterable[_T]] = None,
+        maxlen: typing.Optional[int] = None,
+    ):
+        iterable = [] if iterable is None else iterable
+        self.depth_tracker = DepthTracker()
+        super().__init__(
+            iterable,
+            maxlen,
+            push_interceptor=self.depth_tracker.push,
+            pop_interceptor=self.depth_tracker.pop,
+            bulk_push_interceptor=self.depth_tracker.push,
+            bulk_pop_interceptor=self.depth_tracker.pop,
+        )
+        self.depth_tracker.push(len(self))
@@ -1,3 +1,4 @@
+import asyncio
 import intercepted_deque
 import collections
 import pytest
@@ -12,7 +13,7 @@ def make_std_deque(iterable, maxlen):
 def test_no_interceptor_is_error():
     with pytest.raises(
         AssertionError,
-        match="At least one of 'push_interceptor' or 'pop_interceptor' must be specified",
+        match="At least one push or pop interceptor must be specified",
     ):
         intercepted_deque.InterceptedDeque()
 
@@ -88,3 +89,103 @@ def test_no_mapping(starting_iterable, maxlen, push_intercept, pop_intercept):
             assert m_deque == deque
 
     _test_poplefts()
+
+
+class _BulkIntercept:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, count):
+        self.calls.append(count)
+
+
+@pytest.mark.parametrize(
+    "operation,pushes,pops",
+    [
+        (lambda d: d.extend([6, 7]), [2], []),
+        (lambda d: d.extendleft(iter([6, 7, 8])), [3], []),
+        (lambda d: d.__iadd__([6]), [1], []),
+        (lambda d: d.__imul__(2), [5], []),
+        (lambda d: d.__imul__(0), [], [5]),
+        (lambda d: d.insert(1, 6), [1], []),
+        (lambda d: d.remove(3), [], [1]),
+        (lambda d: d.__delitem__(0), [], [1]),
+        (lambda d: d.clear(), [], [5]),
+        (lambda d: d.rotate(-7), [2], [2]),
+        (lambda d: d.rotate(5), [], []),
+        (lambda d: d.extend([]), [], []),
+    ],
+)
+def test_bulk_interceptors(operation, pushes, pops):
+    push_intercept = _BulkIntercept()
+    pop_intercept = _BulkIntercept()
+    i_deque = intercepted_deque.InterceptedDeque(
+        [1, 2, 3, 4, 5],
+        bulk_push_interceptor=push_intercept,
+        bulk_pop_interceptor=pop_intercept,
+    )
+    deque = collections.deque([1, 2, 3, 4, 5])
+    operation(i_deque)
+    operation(deque)
+    assert i_deque == deque
+    assert push_intercept.calls == pushes
+    assert pop_intercept.calls == pops
+
+
+def test_bulk_interceptors_maxlen():
+    push_intercept = _BulkIntercept()
+    pop_intercept = _BulkIntercept()
+    i_deque = intercepted_deque.InterceptedDeque(
+        [1, 2],
+        3,
+        bulk_push_interceptor=push_intercept,
+        bulk_pop_interceptor=pop_intercept,
+    )
+    i_deque.extend([3, 4, 5])
+    assert push_intercept.calls == [3]
+    assert pop_intercept.calls == [2]
+    i_deque.append(6)
+    i_deque.appendleft(7)
+    assert list(i_deque) == [7, 4, 5]
+    assert push_intercept.calls == [3, 1, 1]
+    assert pop_intercept.calls == [2, 1, 1]
+
+
+def test_bulk_falls_back_to_per_item_interceptors():
+    pops = []
+    i_deque = intercepted_deque.InterceptedDeque(
+        [1, 2, 3], pop_interceptor=lambda: pops.append(None)
+    )
+    i_deque.clear()
+    assert len(pops) == 3
+
+
+def test_depth_tracked_deque():
+    d_deque = intercepted_deque.DepthTrackedDeque([1, 2])
+    tracker = d_deque.depth_tracker
+    assert (tracker.depth, tracker.high_watermark) == (2, 2)
+    d_deque.extend(range(5))
+    d_deque.popleft()
+    d_deque.remove(3)
+    d_deque.rotate(2)
+    assert tracker.depth == len(d_deque) == 5
+    assert tracker.reset_high_watermark() == 7
+    d_deque.clear()
+    d_deque.append(1)
+    assert (tracker.depth, tracker.high_watermark) == (1, 5)
+
+
+async def _spawn(count):
+    await asyncio.gather(*(asyncio.sleep(0) for _ in range(count)))
+
+
+def test_depth_tracked_ready_queue():
+    loop = asyncio.new_event_loop()
+    try:
+        loop._ready = intercepted_deque.DepthTrackedDeque(loop._ready)
+        loop.run_until_complete(_spawn(10))
+        tracker = loop._ready.depth_tracker
+        assert tracker.depth == len(loop._ready)
+        assert tracker.high_watermark >= 10
+    finally:
+        loop.close()
@@ -0,0 +1,76 @@
+import collections
+import typing
+
+
+class AbstractBudgetRecorder(typing.Protocol):
+    def budget_exceeded(self, ran: int, deferred: int):
+        ...
+
+
+class IterationBudgetMixin:
+    # Bounds the handles run per iteration of a 'run_once_loop.RunOnceEventLoop'
+    # subclass to 'max_handles' and/or 'time_budget' seconds (checked after every
+    # handle, so the last handle may overrun it), e.g.:
+    #   class Loop(IterationBudgetMixin, timed_event_loop.InlineTimedEventLoop): ...
+    # Handles left over are deferred to the next iteration, which polls for I/O without
+    # blocking. The I/O callbacks and due timers it queues then run ahead of the backlog
+    # (for '_ready' deques, other containers keep their own order), so that a burst of
+    # handles can't starve them.
+    # Every iteration hitting the budget is reported to 'budget_recorder', and counted.
+    def __init__(
+        self,
+        *args,
+        max_handles: typing.Optional[int] = None,
+        time_budget: typing.Optional[float] = None,
+        budget_recorder: typing.Optional[AbstractBudgetRecorder] = None,
+        **kwargs
+    ):
+        super().__init__(*args, **kwargs)
+        assert (
+            max_handles is not None or time_budget is not None
+        ), "At least one of 'max_handles' or 'time_budget' must be specified"
+        assert (
+            max_handles is None or max_handles >= 1
+        ), "'max_handles' must be at least 1"
+        assert time_budget is None or time_budget > 0, "'time_budget' must be positive"
+        self._max_handles = max_handles
+        self._time_budget = time_budget
+        self._budget_recorder = budget_recorder
+        self.budget_hits = 0
+        self.deferred_handles = 0
+        # Number of handles queued in '_ready' at the end of the last iteration that hit
+        # the budget
+        self._backlog = 0
+
+    def _run_ready(self, ntodo: int) -> int:
+        # Returns the number of handles actually drained from '_ready'
+        backlog = self._backlog
+        if backlog:
+            self._backlog = 0
+            if ntodo > backlog and isinstance(self._ready, collections.deque):
+                # Moves the handles queued by this iteration ahead of the backlog
+                self._ready.rotate(ntodo - backlog)
+        todo = ntodo
+        if self._max_handles is not None and todo > self._max_handles:
+            todo = self._max_handles
+        if self._time_budget is None:
+            ran = super()._run_ready(todo)
+        else:
+            deadline = self.time() + self._time_budget
+            ran = 0
+            while ran < todo:
+                ran += super()._run_ready(1)
+                if self.time() >= deadline:
+                    break
+        deferred = ntodo - ran
+        if not deferred:
+            return ran
+        self._backlog = len(self._ready)
+        self.budget_hits += 1
+        self.deferred_handles += deferred
+        if self._budget_recorder is not None:
+            try:
+                self._budget_recorder.budget_exceeded(ran, deferred)
+            except:
+                ...
+        return ran
@@ -0,0 +1,100 @@
+import asyncio
+import iteration_budget
+import iteration_stats
+import pytest
+import run_once_loop
+import time
+import timed_event_loop
+
+
+class _BudgetLoop(
+    iteration_budget.IterationBudgetMixin, run_once_loop.RunOnceEventLoop
+):
+    pass
+
+
+class _TimedBudgetLoop(
+    iteration_budget.IterationBudgetMixin, timed_event_loop.InlineTimedEventLoop
+):
+    pass
+
+
+class _Recorder(timed_event_loop.AbstractTimeRecorder):
+    def __init__(self):
+        self.events = 0
+        self.budget_hits = []
+
+    def start_event(self):
+        pass
+
+    def end_event(self):
+        self.events += 1
+
+    def budget_exceeded(self, ran, deferred):
+        self.budget_hits.append((ran, deferred))
+
+
+def test_max_handles():
+    recorder = _Recorder()
+    loop = _TimedBudgetLoop(recorder, max_handles=10, budget_recorder=recorder)
+    order = []
+    try:
+        for i in range(25):
+            loop.call_soon(order.append, i)
+        loop.run_until_complete(asyncio.sleep(0))
+    finally:
+        loop.close()
+    assert order == list(range(25))
+    assert recorder.budget_hits[:2] == [(10, 16), (10, 6)]
+    assert loop.budget_hits == len(recorder.budget_hits)
+    assert recorder.events >= 25
+
+
+def test_time_budget_lets_timers_run():
+    loop = _BudgetLoop(time_budget=0.01)
+    order = []
+
+    def block(i):
+        time.sleep(0.001)
+        order.append(i)
+
+    try:
+        for i in range(100):
+            loop.call_soon(block, i)
+        loop.call_later(0.005, order.append, "timer")
+        loop.run_until_complete(asyncio.sleep(0.2))
+    finally:
+        loop.close()
+    assert len(order) == 101
+    assert order.index("timer") < 50
+    assert loop.budget_hits >= 2
+    assert loop.deferred_handles >= 50
+
+
+@pytest.mark.parametrize("stats_first", [True, False])
+def test_iteration_stats_count_handles_run(stats_first):
+    mixins = (
+        iteration_stats.IterationStatsMixin,
+        iteration_budget.IterationBudgetMixin,
+    )
+    loop_class = type(
+        "Loop",
+        (mixins if stats_first else mixins[::-1]) + (run_once_loop.RunOnceEventLoop,),
+        {},
+    )
+    loop = loop_class(max_handles=5)
+    try:
+        for _ in range(20):
+            loop.call_soon(lambda: None)
+        loop.run_until_complete(asyncio.sleep(0))
+    finally:
+        loop.close()
+    handles = [record.handles for record in loop.iteration_stats.export()]
+    assert handles[:4] == [5] * 4
+    # The 20 callbacks and the steps of the main task
+    assert sum(handles) >= 21
+
+
+def test_no_budget_is_error():
+    with pytest.raises(AssertionError, match="At least one of"):
+        _BudgetLoop()
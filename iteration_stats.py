@@ -0,0 +1,92 @@
+import array
+import time
+import typing
+
+
+class IterationRecord(typing.NamedTuple):
+    # Monotonic time (ns) at which the iteration ended
+    end: int
+    # Total time (ns) of the iteration, including polling for I/O
+    duration: int
+    # Number of handles drained from '_ready', including cancelled ones
+    handles: int
+    # Number of timers moved from '_scheduled' to '_ready'
+    timers: int
+
+
+class IterationStats:
+    # Ring buffers holding the statistics of the last 'capacity' loop iterations
+    def __init__(self, capacity: int = 4096):
+        assert capacity >= 1, "'capacity' must be at least 1"
+        self._capacity = capacity
+        self._ends = array.array("Q", bytes(8 * capacity))
+        self._durations = array.array("Q", bytes(8 * capacity))
+        self._handles = array.array("Q", bytes(8 * capacity))
+        self._timers = array.array("Q", bytes(8 * capacity))
+        # Total number of iterations recorded, the next slot is 'total % capacity'
+        self.total = 0
+
+    def record(self, end: int, duration: int, handles: int, timers: int):
+        index = self.total % self._capacity
+        self._ends[index] = end
+        self._durations[index] = duration
+        self._handles[index] = handles
+        self._timers[index] = timers
+        self.total += 1
+
+    def __len__(self) -> int:
+        return min(self.total, self._capacity)
+
+    def export(self) -> typing.List[IterationRecord]:
+        # Oldest iteration first
+        count = len(self)
+        first = self.total - count
+        return [
+            IterationRecord(
+                self._ends[index],
+                self._durations[index],
+                self._handles[index],
+                self._timers[index],
+            )
+            for index in (i % self._capacity for i in range(first, self.total))
+        ]
+
+    def clear(self):
+        self.total = 0
+
+
+class IterationStatsMixin:
+    # Records 'IterationStats' for every iteration of a 'run_once_loop.RunOnceEventLoop'
+    # subclass, e.g.:
+    #   class Loop(IterationStatsMixin, timed_event_loop.InlineTimedEventLoop): ...
+    def __init__(
+        self, *args, iteration_stats: typing.Optional[IterationStats] = None, **kwargs
+    ):
+        super().__init__(*args, **kwargs)
+        self.iteration_stats = (
+            IterationStats() if iteration_stats is None else iteration_stats
+        )
+        self._iteration_handles = 0
+        self._iteration_timers = 0
+
+    def _run_once(self):
+        self._iteration_handles = 0
+        self._iteration_timers = 0
+        start = time.monotonic_ns()
+        super()._run_once()
+        end = time.monotonic_ns()
+        self.iteration_stats.record(
+            end, end - start, self._iteration_handles, self._iteration_timers
+        )
+
+    # Counted where the work happens, as the mixins in between (e.g.
+    # 'iteration_budget.IterationBudgetMixin') may run fewer handles than queued
+    def _schedule_due_timers(self) -> int:
+        timers = super()._schedule_due_timers()
+        self._iteration_timers += timers
+        return timers
+
+    def _run_ready(self, ntodo: int) -> int:
+        handles = super()._run_ready(ntodo)
+        self._iteration_handles += handles
+        return handles
@@ -0,0 +1,72 @@
+import asyncio
+import iteration_stats
+import pytest
+import run_once_loop
+import time
+import timed_event_loop
+
+
+def test_ring_buffer():
+    stats = iteration_stats.IterationStats(capacity=3)
+    assert stats.export() == []
+    for i in range(5):
+        stats.record(i, i * 10, i * 100, i * 1000)
+    assert len(stats) == 3
+    assert stats.total == 5
+    assert stats.export() == [
+        (2, 20, 200, 2000),
+        (3, 30, 300, 3000),
+        (4, 40, 400, 4000),
+    ]
+    stats.clear()
+    assert stats.export() == []
+
+
+class _StatsLoop(iteration_stats.IterationStatsMixin, run_once_loop.RunOnceEventLoop):
+    pass
+
+
+class _TimedStatsLoop(
+    iteration_stats.IterationStatsMixin, timed_event_loop.InlineTimedEventLoop
+):
+    pass
+
+
+class _NullTimeRecorder(timed_event_loop.AbstractTimeRecorder):
+    def start_event(self):
+        pass
+
+    def end_event(self):
+        pass
+
+
+@pytest.mark.parametrize(
+    "loop_factory",
+    [_StatsLoop, lambda: _TimedStatsLoop(_NullTimeRecorder())],
+)
+def test_iteration_stats(loop_factory):
+    BURST = 50
+    BLOCK_DURATION = 0.05
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        done = loop.create_future()
+        for _ in range(BURST):
+            loop.call_soon(lambda: None)
+        loop.call_soon(time.sleep, BLOCK_DURATION)
+        for _ in range(3):
+            loop.call_later(0, lambda: None)
+        loop.call_later(BLOCK_DURATION / 10, done.set_result, None)
+        await done
+
+    loop = loop_factory()
+    try:
+        loop.run_until_complete(run())
+    finally:
+        loop.close()
+    records = loop.iteration_stats.export()
+    assert records
+    assert max(record.handles for record in records) >= BURST + 1
+    assert sum(record.timers for record in records) == 4
+    assert max(record.duration for record in records) >= BLOCK_DURATION * 1e9
+    assert all(a.end <= b.end for a, b in zip(records, records[1:]))
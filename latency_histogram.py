@@ -0,0 +1,156 @@
+import array
+import math
+import time
+import typing
+
+# One hour, beyond that every duration lands in the last bucket (the exact maximum is
+# still tracked separately)
+_DEFAULT_HIGHEST_TRACKABLE_NS = 3600 * 1_000_000_000
+
+
+class LatencyHistogram:
+    # Log-linear (HDR-style) histogram of non-negative integer values: every power of
+    # two range is split in 2**(significant_bits - 1) linear sub buckets, so the
+    # relative error of any reported value is bounded by 2**-(significant_bits - 1).
+    # Memory is allocated once, upfront, and recording is O(1).
+    def __init__(
+        self,
+        *,
+        significant_bits: int = 5,
+        highest_trackable_value: int = _DEFAULT_HIGHEST_TRACKABLE_NS,
+    ):
+        assert significant_bits >= 1, "'significant_bits' must be at least 1"
+        assert (
+            highest_trackable_value >= 1
+        ), "'highest_trackable_value' must be at least 1"
+        self._significant_bits = significant_bits
+        self._highest_trackable_value = highest_trackable_value
+        self._sub_bucket_half_count = 1 << (significant_bits - 1)
+        self._sub_bucket_count = 1 << significant_bits
+        self._last_index = self._index_of(highest_trackable_value)
+        self._counts = array.array("Q", bytes(8 * (self._last_index + 1)))
+        self.count = 0
+        self.total = 0
+        self.min: typing.Optional[int] = None
+        self.max: typing.Optional[int] = None
+
+    def _index_of(self, value: int) -> int:
+        if value < self._sub_bucket_count:
+            return value
+        exponent = value.bit_length() - self._significant_bits
+        return exponent * self._sub_bucket_half_count + (value >> exponent)
+
+    def _highest_equivalent_value(self, index: int) -> int:
+        if index < self._sub_bucket_count:
+            return index
+        exponent = index // self._sub_bucket_half_count - 1
+        sub_bucket = index - exponent * self._sub_bucket_half_count
+        return ((sub_bucket + 1) << exponent) - 1
+
+    def record(self, value: int):
+        if value < 0:
+            value = 0
+        index = self._index_of(value)
+        if index > self._last_index:
+            index = self._last_index
+        self._counts[index] += 1
+        self.count += 1
+        self.total += value
+        if self.max is None or value > self.max:
+            self.max = value
+        if self.min is None or value < self.min:
+            self.min = value
+
+    def _assert_compatible(self, other: "LatencyHistogram"):
+        assert (
+            self._significant_bits == other._significant_bits
+            and self._highest_trackable_value == other._highest_trackable_value
+        ), "Only histograms with the same layout can be merged"
+
+    def merge(self, other: "LatencyHistogram"):
+        self._assert_compatible(other)
+        counts = self._counts
+        for index, count in enumerate(other._counts):
+            if count:
+                counts[index] += count
+        self.count += other.count
+        self.total += other.total
+        if other.max is not None and (self.max is None or other.max > self.max):
+            self.max = other.max
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+
+    def reset(self):
+        self._counts = array.array("Q", bytes(8 * len(self._counts)))
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def snapshot(self, reset: bool = False) -> "LatencyHistogram":
+        snapshot = LatencyHistogram(
+            significant_bits=self._significant_bits,
+            highest_trackable_value=self._highest_trackable_value,
+        )
+        snapshot._counts[:] = self._counts
+        snapshot.count = self.count
+        snapshot.total = self.total
+        snapshot.min = self.min
+        snapshot.max = self.max
+        if reset:
+            self.reset()
+        return snapshot
+
+    @property
+    def mean(self) -> typing.Optional[float]:
+        if not self.count:
+            return None
+        return self.total / self.count
+
+    def percentile(self, percentile: float) -> typing.Optional[int]:
+        assert 0 <= percentile <= 100, "'percentile' must be in [0, 100]"
+        if not self.count:
+            return None
+        # Rank of the requested value, 1-based, rounding up
+        rank = max(1, math.ceil(self.count * percentile / 100))
+        seen = 0
+        for index, count in enumerate(self._counts):
+            seen += count
+            if seen >= rank:
+                if index == self._last_index:
+                    # The last bucket also holds every value above the trackable range
+                    return self.max
+                return min(self._highest_equivalent_value(index), self.max)
+        return self.max
+
+    def p50(self) -> typing.Optional[int]:
+        return self.percentile(50)
+
+    def p99(self) -> typing.Optional[int]:
+        return self.percentile(99)
+
+    def p999(self) -> typing.Optional[int]:
+        return self.percentile(99.9)
+
+
+class HistogramTimeRecorder:
+    # 'timed_event_loop.AbstractTimeRecorder' recording event durations (in ns) into a
+    # 'LatencyHistogram'. The class itself can be used as the 'time_recorder_factory' of
+    # 'timed_event_loop.TimedEventLoopPolicy'.
+    def __init__(
+        self,
+        histogram: typing.Optional[LatencyHistogram] = None,
+        clock: typing.Callable[[], int] = time.perf_counter_ns,
+    ):
+        self.histogram = LatencyHistogram() if histogram is None else histogram
+        self._clock = clock
+        self._curr_event_start = 0
+
+    def start_event(self):
+        self._curr_event_start = self._clock()
+
+    def end_event(self):
+        self.histogram.record(self._clock() - self._curr_event_start)
+
+    def snapshot(self, reset: bool = False) -> LatencyHistogram:
+        return self.histogram.snapshot(reset)
@@ -0,0 +1,103 @@
+import asyncio
+import latency_histogram
+import pytest
+import random
+import time
+import timed_event_loop
+
+
+@pytest.mark.parametrize("significant_bits", [1, 3, 5, 8])
+def test_bucket_round_trip(significant_bits):
+    histogram = latency_histogram.LatencyHistogram(significant_bits=significant_bits)
+    last_index = -1
+    for value in range(0, 1 << 16):
+        index = histogram._index_of(value)
+        # Indices are contiguous and monotonic
+        assert index in (last_index, last_index + 1)
+        last_index = index
+        assert value <= histogram._highest_equivalent_value(index)
+        if index:
+            assert value > histogram._highest_equivalent_value(index - 1)
+
+
+def test_no_values():
+    histogram = latency_histogram.LatencyHistogram()
+    assert histogram.count == 0
+    assert histogram.max is None
+    assert histogram.mean is None
+    assert histogram.p50() is None
+
+
+def test_percentiles_within_relative_error():
+    significant_bits = 7
+    relative_error = 2 ** -(significant_bits - 1)
+    histogram = latency_histogram.LatencyHistogram(significant_bits=significant_bits)
+    values = [random.randint(0, 10**9) for _ in range(10_000)]
+    for value in values:
+        histogram.record(value)
+    values.sort()
+    for percentile in (50, 99, 99.9):
+        exact = values[-(-len(values) * int(percentile * 10) // 1000) - 1]
+        assert abs(histogram.percentile(percentile) - exact) <= exact * relative_error
+    assert histogram.percentile(100) == histogram.max == values[-1]
+    assert histogram.min == values[0]
+    assert histogram.count == len(values)
+    assert histogram.total == sum(values)
+
+
+def test_values_above_highest_trackable_value():
+    histogram = latency_histogram.LatencyHistogram(highest_trackable_value=1000)
+    buckets = len(histogram._counts)
+    histogram.record(10**12)
+    assert len(histogram._counts) == buckets
+    assert histogram.max == 10**12
+    assert histogram.p50() == 10**12
+
+
+def test_merge_and_snapshot():
+    first = latency_histogram.LatencyHistogram()
+    second = latency_histogram.LatencyHistogram()
+    for value in range(1000):
+        first.record(value)
+        second.record(value + 1000)
+    snapshot = first.snapshot()
+    snapshot.merge(second)
+    assert first.count == 1000
+    assert snapshot.count == 2000
+    assert snapshot.min == 0
+    assert snapshot.max == 1999
+    assert abs(snapshot.p50() - 1000) <= 1000 * 2**-4
+
+    snapshot = first.snapshot(reset=True)
+    assert snapshot.count == 1000
+    assert first.count == 0
+    assert first.p99() is None
+
+    with pytest.raises(
+        AssertionError, match="Only histograms with the same layout can be merged"
+    ):
+        first.merge(latency_histogram.LatencyHistogram(significant_bits=3))
+
+
+async def block_coro(block_duration):
+    time.sleep(block_duration)
+
+
+def test_histogram_time_recorder():
+    recorders = []
+
+    def recorder_factory():
+        recorders.append(latency_histogram.HistogramTimeRecorder())
+        return recorders[-1]
+
+    asyncio.set_event_loop_policy(
+        timed_event_loop.TimedEventLoopPolicy(recorder_factory)
+    )
+    try:
+        asyncio.run(block_coro(0.1))
+    finally:
+        asyncio.set_event_loop_policy(None)
+    (recorder,) = recorders
+    snapshot = recorder.snapshot()
+    assert snapshot.count >= 1
+    assert snapshot.max >= 100_000_000
@@ -0,0 +1,54 @@
+import asyncio
+import asyncio_handle_intercept
+import functools
+import hot_instrumentation
+import timed_event_loop
+import typing
+
+LoopFactory = typing.Callable[[], asyncio.AbstractEventLoop]
+
+
+@functools.lru_cache(maxsize=None)
+def timed_loop_class(
+    timed_mixin: type, loop_class: typing.Type[asyncio.BaseEventLoop]
+) -> typing.Type[asyncio.BaseEventLoop]:
+    # Mixes e.g. 'timed_event_loop.InlineTimedMixin' into any 'asyncio.BaseEventLoop'
+    # subclass, the result takes the time recorder as its only argument.
+    return type(
+        "{}{}".format(timed_mixin.__name__.replace("Mixin", ""), loop_class.__name__),
+        (timed_mixin, loop_class),
+        {},
+    )
+
+
+def timed_loop_factory(
+    time_recorder_factory: typing.Callable[[], timed_event_loop.AnyTimeRecorder],
+    loop_factory: LoopFactory = asyncio.DefaultEventLoopPolicy._loop_factory,
+    *,
+    timed_mixin: typing.Optional[type] = None,
+    sampler: typing.Optional[asyncio_handle_intercept.Sampler] = None
+) -> LoopFactory:
+    # Returns a loop factory for 'asyncio.Runner(loop_factory=...)' (or
+    # 'asyncio.run(loop_factory=...)'), timing only the loops it creates, without
+    # touching the global event loop policy.
+    # Without 'timed_mixin', loops created by 'loop_factory' (any callable returning an
+    # 'asyncio.BaseEventLoop') get their '_ready' intercepted, the same way as
+    # 'timed_event_loop.TimedEventLoop'. Otherwise 'loop_factory' must be an
+    # 'asyncio.BaseEventLoop' subclass that 'timed_mixin' is mixed into.
+    if timed_mixin is None:
+
+        def new_event_loop() -> asyncio.AbstractEventLoop:
+            loop = loop_factory()
+            hot_instrumentation.attach_time_recorder(
+                loop, time_recorder_factory(), sampler=sampler
+            )
+            return loop
+
+        return new_event_loop
+
+    assert sampler is None, "'sampler' is not supported with 'timed_mixin'"
+    assert isinstance(
+        loop_factory, type
+    ), "'loop_factory' must be a loop class when 'timed_mixin' is specified"
+    loop_class = timed_loop_class(timed_mixin, loop_factory)
+    return lambda: loop_class(time_recorder_factory())
@@ -0,0 +1,71 @@
+import asyncio
+import loop_factory
+import pytest
+import time
+import timed_event_loop
+
+
+class TimeRecorder(timed_event_loop.AbstractTimeRecorder):
+    def __init__(self):
+        self._curr_event_start = None
+        self.events = []
+
+    def start_event(self):
+        self._curr_event_start = time.perf_counter()
+
+    def end_event(self):
+        self.events.append(time.perf_counter() - self._curr_event_start)
+
+
+class CustomEventLoop(asyncio.SelectorEventLoop):
+    pass
+
+
+async def block_coro(block_duration):
+    time.sleep(block_duration)
+
+
+_BLOCK_DURATION = 0.05
+
+
+@pytest.mark.parametrize(
+    "base_loop_factory", [asyncio.DefaultEventLoopPolicy._loop_factory, CustomEventLoop]
+)
+@pytest.mark.parametrize("timed_mixin", [None, timed_event_loop.InlineTimedMixin])
+def test_timed_loop_factory(base_loop_factory, timed_mixin):
+    recorders = []
+
+    def recorder_factory():
+        recorders.append(TimeRecorder())
+        return recorders[-1]
+
+    policy = asyncio.get_event_loop_policy()
+    factory = loop_factory.timed_loop_factory(
+        recorder_factory, base_loop_factory, timed_mixin=timed_mixin
+    )
+    with asyncio.Runner(loop_factory=factory) as runner:
+        runner.run(block_coro(_BLOCK_DURATION))
+        assert isinstance(runner.get_loop(), base_loop_factory)
+    # Only the loops created by the factory are timed
+    assert asyncio.get_event_loop_policy() is policy
+    (recorder,) = recorders
+    assert max(recorder.events) >= _BLOCK_DURATION
+
+
+def test_timed_loop_class_is_cached():
+    first = loop_factory.timed_loop_class(
+        timed_event_loop.HandleTimedMixin, CustomEventLoop
+    )
+    assert first.__name__ == "HandleTimedCustomEventLoop"
+    assert first is loop_factory.timed_loop_class(
+        timed_event_loop.HandleTimedMixin, CustomEventLoop
+    )
+
+
+def test_timed_mixin_errors():
+    with pytest.raises(AssertionError, match="must be a loop class"):
+        loop_factory.timed_loop_factory(
+            TimeRecorder,
+            lambda: CustomEventLoop(),
+            timed_mixin=timed_event_loop.InlineTimedMixin,
+        )
@@ -0,0 +1,92 @@
+import asyncio
+import selectors
+import time
+import typing
+
+
+class UtilizationSnapshot(typing.NamedTuple):
+    idle: int
+    busy: int
+    iterations: int
+
+    def utilization(self, since: typing.Optional["UtilizationSnapshot"] = None):
+        # Fraction of time spent outside of 'selector.select', i.e. running callbacks
+        # and processing I/O events, optionally since an earlier snapshot
+        idle = self.idle
+        busy = self.busy
+        if since is not None:
+            idle -= since.idle
+            busy -= since.busy
+        if not idle + busy:
+            return 0.0
+        return busy / (idle + busy)
+
+
+class LoopUtilization:
+    # Cumulative time (in ns) the loop spent blocked in 'selector.select' (idle) and
+    # between two polls (busy), and the number of polls (i.e. loop iterations).
+    # Only time the loop is running counts, 'stopped' must be called when it stops
+    # (see 'track_utilization').
+    def __init__(self, clock: typing.Callable[[], int] = time.perf_counter_ns):
+        self.clock = clock
+        self.idle = 0
+        self.busy = 0
+        self.iterations = 0
+        self.last_select_end: typing.Optional[int] = None
+
+    def snapshot(self) -> UtilizationSnapshot:
+        busy = self.busy
+        if self.last_select_end is not None:
+            # Account for the iteration in progress
+            busy += self.clock() - self.last_select_end
+        return UtilizationSnapshot(self.idle, busy, self.iterations)
+
+    def stopped(self):
+        # The loop was busy from the last poll until it stopped, and is neither busy nor
+        # idle until it runs again
+        if self.last_select_end is not None:
+            self.busy += self.clock() - self.last_select_end
+            self.last_select_end = None
+
+
+class UtilizationSelector:
+    def __init__(self, base: selectors.BaseSelector, utilization: LoopUtilization):
+        self._base = base
+        self._utilization = utilization
+
+    def select(self, timeout: typing.Optional[float] = None):
+        utilization = self._utilization
+        start = utilization.clock()
+        if utilization.last_select_end is not None:
+            utilization.busy += start - utilization.last_select_end
+        try:
+            return self._base.select(timeout)
+        finally:
+            end = utilization.clock()
+            utilization.idle += end - start
+            utilization.iterations += 1
+            utilization.last_select_end = end
+
+    def __getattr__(self, item):
+        return getattr(self._base, item)
+
+
+def track_utilization(
+    loop: asyncio.BaseEventLoop, utilization: typing.Optional[LoopUtilization] = None
+) -> LoopUtilization:
+    # Only selector based loops are supported, i.e. loops polling '_selector' in
+    # '_run_once'
+    utilization = LoopUtilization() if utilization is None else utilization
+    loop._selector = UtilizationSelector(loop._selector, utilization)
+    run_forever = loop.run_forever
+
+    # Bound to the instance (like the selector), so that any loop class is supported.
+    # 'run_until_complete' runs the loop through 'run_forever' too.
+    def tracked_run_forever():
+        try:
+            run_forever()
+        finally:
+            utilization.stopped()
+
+    loop.run_forever = tracked_run_forever
+    return utilization
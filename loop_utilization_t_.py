@@ -0,0 +1,49 @@
+import asyncio
+import loop_utilization
+import time
+
+
+def test_utilization():
+    BLOCK_DURATION = 0.1
+
+    async def run():
+        time.sleep(BLOCK_DURATION)
+        await asyncio.sleep(BLOCK_DURATION)
+
+    loop = asyncio.DefaultEventLoopPolicy._loop_factory()
+    utilization = loop_utilization.track_utilization(loop)
+    try:
+        before = utilization.snapshot()
+        loop.run_until_complete(run())
+        after = utilization.snapshot()
+    finally:
+        loop.close()
+    assert after.iterations > before.iterations
+    assert after.busy - before.busy >= BLOCK_DURATION * 1e9
+    assert after.idle - before.idle >= BLOCK_DURATION * 0.9 * 1e9
+    assert 0.3 < after.utilization(before) < 0.7
+
+
+def test_idle_between_runs():
+    IDLE_DURATION = 0.2
+
+    loop = asyncio.DefaultEventLoopPolicy._loop_factory()
+    utilization = loop_utilization.track_utilization(loop)
+    try:
+        loop.run_until_complete(asyncio.sleep(0.05))
+        time.sleep(IDLE_DURATION)
+        loop.run_until_complete(asyncio.sleep(0.05))
+        time.sleep(IDLE_DURATION)
+        snapshot = utilization.snapshot()
+    finally:
+        loop.close()
+    # Neither busy nor idle while the loop is not running
+    assert snapshot.busy + snapshot.idle < IDLE_DURATION * 1e9
+    assert snapshot.utilization() < 0.3
+    assert utilization.last_select_end is None
+
+
+def test_no_iterations():
+    snapshot = loop_utilization.LoopUtilization().snapshot()
+    assert snapshot == (0, 0, 0)
+    assert snapshot.utilization() == 0.0
@@ -1,24 +1,69 @@
 import collections
+import collections.abc
 import typing
 
 _X = typing.TypeVar("_X")
 _T = typing.TypeVar("_T")
 
+# Placeholder in the memoized mapped items of slots not mapped yet
+_UNMAPPED = object()
+
 
 class MappedDeque(collections.deque):
+    # Holds the raw items, 'mapping' is applied when items are popped or indexed.
+    # Iterating over the deque, 'index', 'count', 'in' and comparisons see the raw items,
+    # 'mapped()' is a view of the mapped ones.
+    # With 'memoize', the mapped result of every slot is kept until the slot is popped,
+    # so that an item is only mapped once however many times it is looked at, and is
+    # popped as the very object that was looked at. Mutations moving items around
+    # (e.g. 'insert', 'remove') invalidate all the memoized results.
+    # NOTE: placeholders for memoized results are pushed before the items, and popped
+    # after them, so that 'append'/'extend' from other threads (e.g.
+    # 'call_soon_threadsafe') racing with 'popleft' keep both in sync. Other mutations
+    # must only happen in the loop thread.
+    # With 'map_on_push', 'mapping' is applied once as items are pushed instead, the
+    # deque then only ever holds mapped items.
     def __init__(
         self,
         iterable: typing.Optional[typing.Iterable[_T]] = None,
         maxlen: typing.Optional[int] = None,
         mapping: typing.Optional[typing.Callable[[_T], _X]] = None,
+        *,
+        memoize: bool = False,
+        map_on_push: bool = False
     ):
+        assert not (
+            memoize and map_on_push
+        ), "Only one of 'memoize' or 'map_on_push' can be specified"
         iterable = [] if iterable is None else iterable
-        super().__init__(iterable, maxlen)
         self._mapping = mapping
-        if self._mapping is None:
+        self._map_on_push = map_on_push and mapping is not None
+        self._memoized: typing.Optional[collections.deque] = None
+        if self._map_on_push:
+            iterable = map(mapping, iterable)
+        super().__init__(iterable, maxlen)
+        if self._mapping is None or self._map_on_push:
             self._get_item = super().__getitem__
             self.pop = super().pop
             self.popleft = super().popleft
+        if self._map_on_push:
+            self.append = self._map_append
+            self.appendleft = self._map_appendleft
+            self.extend = self._map_extend
+            self.extendleft = self._map_extendleft
+            self.insert = self._map_insert
+        elif memoize and self._mapping is not None:
+            self._memoized = collections.deque((_UNMAPPED for _ in self), maxlen)
+            self._get_item = self._memoized_get_item
+            self.pop = self._memoized_pop
+            self.popleft = self._memoized_popleft
+            self.append = self._memoized_append
+            self.appendleft = self._memoized_appendleft
+            self.extend = self._memoized_extend
+            self.extendleft = self._memoized_extendleft
+
+    def mapped(self) -> "MappedView":
+        return MappedView(self)
 
     def pop(self) -> _X:
         return self._mapping(super().pop())
@@ -32,3 +77,136 @@ class MappedDeque(collections.deque):
 
     def _get_item(self, __index: typing.SupportsIndex) -> _X:
         return self._mapping(super().__getitem__(__index))
+
+    # map_on_push
+    def _map_append(self, x: _T):
+        super().append(self._mapping(x))
+
+    def _map_appendleft(self, x: _T):
+        super().appendleft(self._mapping(x))
+
+    def _map_extend(self, iterable: typing.Iterable[_T]):
+        super().extend(map(self._mapping, iterable))
+
+    def _map_extendleft(self, iterable: typing.Iterable[_T]):
+        super().extendleft(map(self._mapping, iterable))
+
+    def _map_insert(self, i: int, x: _T):
+        super().insert(i, self._mapping(x))
+
+    # memoize
+    def _memoized_get_item(self, __index: typing.SupportsIndex) -> _X:
+        mapped = self._memoized[__index]
+        if mapped is _UNMAPPED:
+            mapped = self._mapping(super().__getitem__(__index))
+            self._memoized[__index] = mapped
+        return mapped
+
+    def _memoized_pop(self) -> _X:
+        ret = super().pop()
+        mapped = self._memoized.pop()
+        return self._mapping(ret) if mapped is _UNMAPPED else mapped
+
+    def _memoized_popleft(self) -> _X:
+        ret = super().popleft()
+        mapped = self._memoized.popleft()
+        return self._mapping(ret) if mapped is _UNMAPPED else mapped
+
+    def _memoized_append(self, x: _T):
+        self._memoized.append(_UNMAPPED)
+        super().append(x)
+
+    def _memoized_appendleft(self, x: _T):
+        self._memoized.appendleft(_UNMAPPED)
+        super().appendleft(x)
+
+    def _memoized_extend(self, iterable: typing.Iterable[_T]):
+        items = list(iterable)
+        self._memoized.extend(_UNMAPPED for _ in items)
+        super().extend(items)
+
+    def _memoized_extendleft(self, iterable: typing.Iterable[_T]):
+        items = list(iterable)
+        self._memoized.extendleft(_UNMAPPED for _ in items)
+        super().extendleft(items)
+
+    def _invalidate(self):
+        if self._memoized is not None:
+            self._memoized = collections.deque((_UNMAPPED for _ in self), self.maxlen)
+
+    # Rarely used mutations, which deque doesn't implement through the methods above
+    def __setitem__(self, __index: typing.SupportsIndex, value: _T):  # type: ignore
+        if self._map_on_push:
+            value = self._mapping(value)
+        super().__setitem__(__index, value)
+        if self._memoized is not None:
+            self._memoized[__index] = _UNMAPPED
+
+    def __delitem__(self, __index: typing.SupportsIndex):  # type: ignore
+        super().__delitem__(__index)
+        if self._memoized is not None:
+            del self._memoized[__index]
+
+    def __iadd__(self, iterable: typing.Iterable[_T]) -> "MappedDeque":
+        self.extend(iterable)
+        return self
+
+    def __imul__(self, n: int) -> "MappedDeque":
+        super().__imul__(n)
+        self._invalidate()
+        return self
+
+    def insert(self, i: int, x: _T):
+        super().insert(i, x)
+        self._invalidate()
+
+    def remove(self, value: _T):
+        super().remove(value)
+        self._invalidate()
+
+    def clear(self):
+        super().clear()
+        if self._memoized is not None:
+            self._memoized.clear()
+
+    def rotate(self, n: int = 1):
+        super().rotate(n)
+        if self._memoized is not None:
+            self._memoized.rotate(n)
+
+    def reverse(self):
+        super().reverse()
+        if self._memoized is not None:
+            self._memoized.reverse()
+
+
+class MappedView(collections.abc.Sequence):
+    # Read only view of the mapped items of a 'MappedDeque', mapping them lazily as
+    # they are accessed (memoized if the deque is). Like iterating over a deque,
+    # iterating over the view fails if the deque is mutated meanwhile.
+    def __init__(self, deque: MappedDeque):
+        self._deque = deque
+
+    def __len__(self) -> int:
+        return len(self._deque)
+
+    def __getitem__(self, index: typing.SupportsIndex) -> _X:  # type: ignore
+        return self._deque[index]
+
+    def __iter__(self) -> typing.Iterator[_X]:
+        deque = self._deque
+        raw_items = collections.deque.__iter__(deque)
+        if deque._mapping is None or deque._map_on_push:
+            yield from raw_items
+        elif deque._memoized is None:
+            yield from map(deque._mapping, raw_items)
+        else:
+            memoized = deque._memoized
+            for index, (raw_item, mapped) in enumerate(zip(raw_items, memoized)):
+                if mapped is _UNMAPPED:
+                    mapped = memoized[index] = deque._mapping(raw_item)
+                yield mapped
+
+    def __reversed__(self) -> typing.Iterator[_X]:
+        for index in range(len(self._deque) - 1, -1, -1):
+            yield self._deque[index]
@@ -140,3 +140,87 @@ def test_constructor_mapping(starting_iterable, maxlen):
             assert m_deque == deque
 
     _test_poplefts()
+
+
+class _CountingMapping:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, x):
+        self.calls += 1
+        return [x]
+
+
+@pytest.mark.parametrize(
+    "kwargs", [{}, {"memoize": True}, {"map_on_push": True}], ids=str
+)
+def test_mapped_view(kwargs):
+    m_deque = mapped_deque.MappedDeque([1, 2, 3], None, _CountingMapping(), **kwargs)
+    view = m_deque.mapped()
+    assert list(view) == [[1], [2], [3]]
+    assert list(reversed(view)) == [[3], [2], [1]]
+    assert view[-1] == [3]
+    assert [2] in view and 2 not in view
+    assert view.index([2]) == 1
+    assert view.count([3]) == 1
+    m_deque.append(4)
+    m_deque.appendleft(0)
+    m_deque.extend([5])
+    m_deque.extendleft([-1])
+    m_deque.insert(2, 7)
+    m_deque.remove(m_deque[2] if kwargs.get("map_on_push") else 7)
+    m_deque[0] = -2
+    del m_deque[1]
+    m_deque.rotate(2)
+    m_deque += [6]
+    assert list(view) == [[4], [5], [-2], [1], [2], [3], [6]]
+    assert m_deque.popleft() == [4]
+    assert m_deque.pop() == [6]
+    m_deque.clear()
+    assert list(view) == []
+
+
+def test_memoize():
+    mapping = _CountingMapping()
+    m_deque = mapped_deque.MappedDeque([1, 2, 3], 3, mapping, memoize=True)
+    view = m_deque.mapped()
+    first = view[0]
+    assert list(view)[0] is first
+    assert m_deque.popleft() is first
+    assert mapping.calls == 3
+    m_deque.extend([4, 5])
+    assert m_deque == collections.deque([3, 4, 5])
+    assert list(view) == [[3], [4], [5]]
+    assert mapping.calls == 5
+    last = view[-1]
+    m_deque.reverse()
+    assert m_deque.popleft() is last
+    # Invalidated
+    m_deque.insert(0, 6)
+    assert list(view) == [[6], [4], [3]]
+    assert mapping.calls == 8
+
+
+def test_map_on_push():
+    mapping = _CountingMapping()
+    m_deque = mapped_deque.MappedDeque([1], None, mapping, map_on_push=True)
+    m_deque.append(2)
+    assert m_deque == collections.deque([[1], [2]])
+    assert m_deque[0] == list(m_deque.mapped())[0] == m_deque.popleft() == [1]
+    assert mapping.calls == 2
+
+
+def test_memoize_and_map_on_push_is_error():
+    with pytest.raises(AssertionError, match="Only one of"):
+        mapped_deque.MappedDeque(mapping=str, memoize=True, map_on_push=True)
+
+
+def test_memoize_append_racing_with_popleft():
+    m_deque = mapped_deque.MappedDeque([1], None, _CountingMapping(), memoize=True)
+    first = m_deque.mapped()[0]
+    # Another thread in the middle of 'append(2)', having pushed the placeholder only
+    m_deque._memoized.append(mapped_deque._UNMAPPED)
+    assert m_deque.popleft() is first
+    collections.deque.append(m_deque, 2)
+    assert m_deque.popleft() == [2]
+    assert not m_deque._memoized
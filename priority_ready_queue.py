@@ -0,0 +1,117 @@
+import asyncio
+import collections
+import contextvars
+import typing
+
+# Returns the level of a handle, 0 being the highest priority
+Classifier = typing.Callable[[asyncio.Handle], int]
+
+
+def contextvar_classifier(
+    var: "contextvars.ContextVar[int]", default: int
+) -> Classifier:
+    # Classifies handles by the value of 'var' in the context they run in, e.g. the
+    # steps of a task created while 'var' is set, or the callbacks of a reader added
+    # while it is set
+    def classify(handle: asyncio.Handle) -> int:
+        return handle._context.get(var, default)
+
+    return classify
+
+
+class PriorityReadyQueue:
+    # Drop-in replacement for the '_ready' deque of a loop, with a FIFO queue per
+    # priority level, so that within a loop iteration handles run in priority order.
+    # 'popleft' works in rounds: when a round starts (i.e. at the first 'popleft' of a
+    # loop iteration, which pops as many handles as there are queued) the length of
+    # every level is snapshotted, and the round only pops these handles, from the
+    # highest priority level first. Like with a plain deque, handles pushed meanwhile
+    # are left for the next round, so a high priority task yielding in a loop can't
+    # starve the lower levels.
+    # All operations are O(levels). Only 'popleft' updates the round counters, so pushes
+    # from other threads (e.g. 'call_soon_threadsafe') are as safe as with a plain
+    # deque.
+    def __init__(
+        self,
+        classifier: Classifier,
+        levels: int = 2,
+        default_level: typing.Optional[int] = None,
+    ):
+        assert levels >= 1, "'levels' must be at least 1"
+        self._classifier = classifier
+        self._queues = tuple(collections.deque() for _ in range(levels))
+        # Used when 'classifier' fails or returns an invalid level
+        self._default_queue = self._queues[
+            levels - 1 if default_level is None else default_level
+        ]
+        # Handles left to pop in the current round, per level and in total
+        self._round = [0] * levels
+        self._round_remaining = 0
+
+    def _queue_of(self, handle: asyncio.Handle) -> collections.deque:
+        try:
+            level = self._classifier(handle)
+        except:
+            return self._default_queue
+        if 0 <= level < len(self._queues):
+            return self._queues[level]
+        return self._default_queue
+
+    def append(self, handle: asyncio.Handle):
+        self._queue_of(handle).append(handle)
+
+    def appendleft(self, handle: asyncio.Handle):
+        self._queue_of(handle).appendleft(handle)
+
+    def popleft(self) -> asyncio.Handle:
+        round_ = self._round
+        if not self._round_remaining:
+            for level, queue in enumerate(self._queues):
+                round_[level] = len(queue)
+            self._round_remaining = sum(round_)
+            if not self._round_remaining:
+                raise IndexError("pop from an empty deque")
+        for level, queue in enumerate(self._queues):
+            if round_[level]:
+                round_[level] -= 1
+                self._round_remaining -= 1
+                return queue.popleft()
+        # Only reachable if the levels were emptied by something else than 'popleft'
+        raise IndexError("pop from an empty deque")
+
+    def __len__(self) -> int:
+        return sum(map(len, self._queues))
+
+    def __iter__(self) -> typing.Iterator[asyncio.Handle]:
+        # In the order the handles would be popped
+        for queue in self._queues:
+            yield from queue
+
+    def level_lengths(self) -> typing.List[int]:
+        return [len(queue) for queue in self._queues]
+
+    def clear(self):
+        for queue in self._queues:
+            queue.clear()
+        self._round = [0] * len(self._queues)
+        self._round_remaining = 0
+
+
+class PriorityReadyMixin:
+    # Replaces the '_ready' deque of a loop with a 'PriorityReadyQueue', e.g.:
+    #   class Loop(PriorityReadyMixin, timed_event_loop.InlineTimedEventLoop): ...
+    # NOTE: not compatible with loops that already replace '_ready' (e.g.
+    # 'timed_event_loop.TimedEventLoop')
+    def __init__(
+        self,
+        *args,
+        classifier: Classifier,
+        levels: int = 2,
+        default_level: typing.Optional[int] = None,
+        **kwargs
+    ):
+        super().__init__(*args, **kwargs)
+        assert (
+            type(self._ready) is collections.deque
+        ), "Only loops with a plain '_ready' deque are supported"
+        self._ready = PriorityReadyQueue(classifier, levels, default_level)
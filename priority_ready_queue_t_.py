@@ -0,0 +1,131 @@
+import asyncio
+import contextvars
+import priority_ready_queue
+import pytest
+import run_once_loop
+import timed_event_loop
+
+PRIORITY: "contextvars.ContextVar[int]" = contextvars.ContextVar("priority")
+_HIGH = 0
+
+
+class _PriorityLoop(
+    priority_ready_queue.PriorityReadyMixin, run_once_loop.RunOnceEventLoop
+):
+    pass
+
+
+class _NullTimeRecorder(timed_event_loop.AbstractTimeRecorder):
+    def start_event(self):
+        pass
+
+    def end_event(self):
+        pass
+
+
+class _TimedPriorityLoop(
+    priority_ready_queue.PriorityReadyMixin, timed_event_loop.InlineTimedEventLoop
+):
+    pass
+
+
+def test_queue():
+    queue = priority_ready_queue.PriorityReadyQueue(lambda x: x // 10, levels=3)
+    for x in (25, 5, 26, 15, 99, -1, 6):
+        queue.append(x)
+    queue.appendleft(7)
+    assert len(queue) == 8
+    assert queue.level_lengths() == [3, 1, 4]
+    assert list(queue) == [7, 5, 6, 15, 25, 26, 99, -1]
+    assert [queue.popleft() for _ in range(8)] == [7, 5, 6, 15, 25, 26, 99, -1]
+    with pytest.raises(IndexError):
+        queue.popleft()
+    queue.append(1)
+    queue.clear()
+    assert not queue
+
+
+def test_classifier_errors_use_default_level():
+    queue = priority_ready_queue.PriorityReadyQueue(
+        lambda x: 2 // x, levels=3, default_level=1
+    )
+    queue.append(0)
+    queue.append(1)
+    assert queue.level_lengths() == [0, 1, 1]
+
+
+@pytest.mark.parametrize(
+    "loop_factory",
+    [
+        lambda **kwargs: _PriorityLoop(**kwargs),
+        lambda **kwargs: _TimedPriorityLoop(_NullTimeRecorder(), **kwargs),
+    ],
+)
+def test_priority_loop(loop_factory):
+    order = []
+
+    async def handle_request(name):
+        order.append(name)
+        await asyncio.sleep(0)
+        order.append(name)
+
+    async def run_all():
+        tasks = [asyncio.create_task(handle_request("bulk")) for _ in range(3)]
+        PRIORITY.set(_HIGH)
+        # Steps of the task run with its (copied) context, and so high priority
+        tasks.append(asyncio.create_task(handle_request("health")))
+        PRIORITY.set(1)
+        await asyncio.gather(*tasks)
+
+    loop = loop_factory(
+        classifier=priority_ready_queue.contextvar_classifier(PRIORITY, 1)
+    )
+    try:
+        loop.run_until_complete(run_all())
+    finally:
+        loop.close()
+    # One step of every task per iteration, in priority order
+    assert order == (["health"] + ["bulk"] * 3) * 2
+
+
+def test_yielding_high_priority_task_does_not_starve_others():
+    order = []
+
+    async def high():
+        for _ in range(1000):
+            order.append("high")
+            await asyncio.sleep(0)
+
+    async def bulk():
+        for _ in range(3):
+            order.append("bulk")
+            await asyncio.sleep(0)
+
+    async def run_all():
+        bulk_task = asyncio.create_task(bulk())
+        PRIORITY.set(_HIGH)
+        high_task = asyncio.create_task(high())
+        await bulk_task
+        high_task.cancel()
+
+    loop = _PriorityLoop(
+        classifier=priority_ready_queue.contextvar_classifier(PRIORITY, 1)
+    )
+    try:
+        loop.run_until_complete(run_all())
+    finally:
+        loop.close()
+    assert order[:6] == ["high", "bulk"] * 3
+    # Until 'run_all' resumes and cancels it
+    assert order.count("high") < 10
+
+
+def test_replaced_ready_is_error():
+    with pytest.raises(AssertionError, match="plain '_ready' deque"):
+
+        class _Loop(
+            priority_ready_queue.PriorityReadyMixin, timed_event_loop.TimedEventLoop
+        ):
+            pass
+
+        _Loop(_NullTimeRecorder(), classifier=lambda handle: 0)
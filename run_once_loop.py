@@ -0,0 +1,110 @@
+import asyncio
+import asyncio.base_events as aio_base_events
+import heapq
+
+
+class RunOnceMixin:
+    # Re-implementation of 'BaseEventLoop._run_once' split into steps, so that
+    # subclasses can instrument a single step of the loop iteration without having
+    # to wrap every handle that goes through '_ready'. Meant to be mixed into any
+    # 'asyncio.BaseEventLoop' subclass.
+    # NOTE: this mirrors the CPython implementation and needs to be kept in sync
+    # with it.
+    def _run_once(self):
+        self._clean_scheduled()
+        event_list = self._selector.select(self._select_timeout())
+        self._process_events(event_list)
+        # Needed to break cycles when an exception occurs.
+        event_list = None
+        self._schedule_due_timers()
+        # We run all currently scheduled callbacks, but not any callbacks scheduled
+        # by callbacks run this time around -- they will be run the next time
+        # (after another I/O poll).
+        self._run_ready(len(self._ready))
+
+    def _clean_scheduled(self):
+        sched_count = len(self._scheduled)
+        if (
+            sched_count > aio_base_events._MIN_SCHEDULED_TIMER_HANDLES
+            and self._timer_cancelled_count / sched_count
+            > aio_base_events._MIN_CANCELLED_TIMER_HANDLES_FRACTION
+        ):
+            # Remove delayed calls that were cancelled if their number is too high
+            new_scheduled = []
+            for handle in self._scheduled:
+                if handle._cancelled:
+                    handle._scheduled = False
+                else:
+                    new_scheduled.append(handle)
+
+            heapq.heapify(new_scheduled)
+            self._scheduled = new_scheduled
+            self._timer_cancelled_count = 0
+        else:
+            # Remove delayed calls that were cancelled from head of queue.
+            while self._scheduled and self._scheduled[0]._cancelled:
+                self._timer_cancelled_count -= 1
+                handle = heapq.heappop(self._scheduled)
+                handle._scheduled = False
+
+    def _select_timeout(self):
+        if self._ready or self._stopping:
+            return 0
+        if self._scheduled:
+            when = self._scheduled[0]._when
+            return min(
+                max(0, when - self.time()), aio_base_events.MAXIMUM_SELECT_TIMEOUT
+            )
+        return None
+
+    def _schedule_due_timers(self) -> int:
+        # Returns the number of timers moved to '_ready'
+        end_time = self.time() + self._clock_resolution
+        count = 0
+        while self._scheduled:
+            handle = self._scheduled[0]
+            if handle._when >= end_time:
+                break
+            handle = heapq.heappop(self._scheduled)
+            handle._scheduled = False
+            self._ready.append(handle)
+            count += 1
+        return count
+
+    def _run_ready(self, ntodo: int) -> int:
+        # Returns the number of handles drained from '_ready', including cancelled ones
+        # NOTE: '_ready' is looked up for every handle on purpose, callbacks may swap it
+        # (see 'hot_instrumentation')
+        if self._debug:
+            for _ in range(ntodo):
+                handle = self._ready.popleft()
+                if handle._cancelled:
+                    continue
+                self._run_handle_debug(handle)
+        else:
+            for _ in range(ntodo):
+                handle = self._ready.popleft()
+                if handle._cancelled:
+                    continue
+                handle._run()
+        handle = None  # Needed to break cycles when an exception occurs.
+        return ntodo
+
+    def _run_handle_debug(self, handle: asyncio.Handle):
+        try:
+            self._current_handle = handle
+            t0 = self.time()
+            handle._run()
+            dt = self.time() - t0
+            if dt >= self.slow_callback_duration:
+                aio_base_events.logger.warning(
+                    "Executing %s took %.3f seconds",
+                    aio_base_events._format_handle(handle),
+                    dt,
+                )
+        finally:
+            self._current_handle = None
+
+
+class RunOnceEventLoop(RunOnceMixin, asyncio.DefaultEventLoopPolicy._loop_factory):
+    pass
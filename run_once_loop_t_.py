@@ -0,0 +1,44 @@
+import asyncio
+import run_once_loop
+import pytest
+
+
+async def mixed_workload():
+    loop = asyncio.get_running_loop()
+    order = []
+    # Enough cancelled timers to trigger the bulk cleanup of '_scheduled'
+    cancelled = [loop.call_later(10, order.append, "cancelled") for _ in range(200)]
+    for handle in cancelled:
+        handle.cancel()
+    loop.call_later(0.02, order.append, "later")
+    loop.call_soon(order.append, "soon")
+    cancelled_soon = loop.call_soon(order.append, "cancelled")
+    cancelled_soon.cancel()
+    await asyncio.sleep(0.05)
+    reader, writer = await asyncio.open_connection(*(await _echo_server_address()))
+    writer.write(b"ping\n")
+    order.append((await reader.readline()).strip())
+    writer.close()
+    await writer.wait_closed()
+    return order
+
+
+async def _echo_server_address():
+    async def echo(reader, writer):
+        writer.write(await reader.readline())
+        await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(echo, "127.0.0.1", 0)
+    return server.sockets[0].getsockname()[:2]
+
+
+@pytest.mark.parametrize("debug", [False, True])
+def test_run_once_event_loop(debug):
+    loop = run_once_loop.RunOnceEventLoop()
+    loop.set_debug(debug)
+    try:
+        order = loop.run_until_complete(mixed_workload())
+    finally:
+        loop.close()
+    assert order == ["soon", "later", b"ping"]
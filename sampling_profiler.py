@@ -0,0 +1,87 @@
+import asyncio
+import callsite_registry
+import collections
+import sys
+import threading
+import typing
+
+_HANDLE_RUN_CODE = asyncio.Handle._run.__code__
+
+
+class SamplingProfiler:
+    # Implements 'timed_event_loop.AbstractHandleTimeRecorder'. The hooks only publish
+    # the handle being run, a profiler thread samples it along with the stack of the
+    # loop thread 'frequency' times per second, and aggregates the samples as folded
+    # stacks (as consumed by flamegraph.pl/speedscope) rooted at the call site of the
+    # handle's callback, i.e. the task's coroutine for task steps.
+    # 'loop_thread_id' defaults to the thread creating the profiler.
+    def __init__(
+        self,
+        frequency: float = 100.0,
+        *,
+        loop_thread_id: typing.Optional[int] = None,
+        resolver: typing.Optional[callsite_registry.CallSiteResolver] = None
+    ):
+        assert frequency > 0, "'frequency' must be positive"
+        self._interval = 1 / frequency
+        self._loop_thread_id = (
+            threading.get_ident() if loop_thread_id is None else loop_thread_id
+        )
+        self._resolver = (
+            callsite_registry.CallSiteResolver() if resolver is None else resolver
+        )
+        self._handle: typing.Optional[asyncio.Handle] = None
+        self.samples: typing.Counter[str] = collections.Counter()
+        # Samples taken while no handle was running, e.g. polling for I/O
+        self.idle_samples = 0
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="asyncio-intercept-profiler", daemon=True
+        )
+
+    def start_handle(self, handle: asyncio.Handle):
+        self._handle = handle
+
+    def end_handle(self, handle: asyncio.Handle):
+        self._handle = None
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread.is_alive():
+            self._thread.join()
+
+    def _run(self):
+        while not self._stopped.wait(self._interval):
+            self.sample()
+
+    def sample(self):
+        handle = self._handle
+        if handle is None:
+            self.idle_samples += 1
+            return
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None or self._handle is not handle:
+            # The handle finished while sampling
+            return
+        frames = []
+        while frame is not None and frame.f_code is not _HANDLE_RUN_CODE:
+            code = frame.f_code
+            frames.append(getattr(code, "co_qualname", code.co_name))
+            frame = frame.f_back
+        del frame
+        call_site, _ = self._resolver.resolve(handle)
+        frames.append(call_site.name)
+        frames.reverse()
+        self.samples[";".join(frames)] += 1
+
+    def folded(self) -> typing.List[str]:
+        return [
+            "{} {}".format(stack, count) for stack, count in self.samples.most_common()
+        ]
+
+    def write_folded(self, path: str):
+        with open(path, "w") as output:
+            output.writelines(line + "\n" for line in self.folded())
@@ -0,0 +1,44 @@
+import asyncio
+import sampling_profiler
+import time
+import timed_event_loop
+
+
+def busy_wait(duration):
+    end = time.perf_counter() + duration
+    while time.perf_counter() < end:
+        pass
+
+
+async def hot_coro():
+    busy_wait(0.2)
+
+
+async def cold_coro():
+    busy_wait(0.02)
+
+
+async def run():
+    await asyncio.gather(hot_coro(), cold_coro())
+    await asyncio.sleep(0.05)
+
+
+def test_sampling_profiler(tmp_path):
+    profiler = sampling_profiler.SamplingProfiler(frequency=200)
+    loop = timed_event_loop.HandleTimedEventLoop(profiler)
+    profiler.start()
+    try:
+        loop.run_until_complete(run())
+    finally:
+        profiler.stop()
+        loop.close()
+    hot_samples = profiler.samples["hot_coro;hot_coro;busy_wait"]
+    cold_samples = profiler.samples["cold_coro;cold_coro;busy_wait"]
+    assert hot_samples > cold_samples
+    assert profiler.idle_samples > 0
+    path = str(tmp_path / "profile.folded")
+    profiler.write_folded(path)
+    with open(path) as folded:
+        assert folded.readline() == "hot_coro;hot_coro;busy_wait {}\n".format(
+            hot_samples
+        )
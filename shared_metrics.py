@@ -0,0 +1,207 @@
+import array
+import latency_histogram
+import mmap
+import os
+import time
+import typing
+
+_MAGIC = 0x4D54454D4F494E41
+_VERSION = 1
+# magic, version, num_workers, significant_bits, highest_trackable_value,
+# num_buckets, num_counters, slot_words
+_HEADER_WORDS = 8
+# Comma separated counter names, ASCII
+_COUNTER_NAMES_BYTES = 1024
+# pid, count, total, min, max
+_SLOT_HEADER_WORDS = 5
+_PID, _COUNT, _TOTAL, _MIN, _MAX = range(_SLOT_HEADER_WORDS)
+_NO_MIN = (1 << 64) - 1
+
+
+class WorkerMetrics(typing.NamedTuple):
+    # 0 for slots that were never written to, and for merged metrics
+    pid: int
+    histogram: latency_histogram.LatencyHistogram
+    counters: typing.Dict[str, int]
+
+
+class SharedMetrics:
+    # Fixed layout of per worker event duration histograms and counters in a file
+    # mapped in memory (e.g. under /dev/shm), one slot per worker process. Workers only
+    # ever write to their own slot, readers merge all slots straight from the mapping,
+    # without any IPC or (un)pickling. Reads are not synchronized with writes, so a
+    # snapshot may be off by the events being recorded while it is taken.
+    def __init__(self, path: str, mapping: mmap.mmap):
+        self.path = path
+        self._mmap = mapping
+        self._words = memoryview(mapping).cast("Q")
+        words = self._words
+        assert words[0] == _MAGIC, "Not a shared metrics file: {}".format(path)
+        assert words[1] == _VERSION, "Unsupported shared metrics version"
+        self.num_workers = words[2]
+        self._significant_bits = words[3]
+        self._highest_trackable_value = words[4]
+        self._num_buckets = words[5]
+        num_counters = words[6]
+        self._slot_words = words[7]
+        names_offset = _HEADER_WORDS * 8
+        names = bytes(mapping[names_offset : names_offset + _COUNTER_NAMES_BYTES])
+        names = names.rstrip(b"\0").decode("ascii")
+        self.counter_names: typing.Tuple[str, ...] = (
+            tuple(names.split(",")) if names else ()
+        )
+        assert len(self.counter_names) == num_counters
+
+    @classmethod
+    def create(
+        cls,
+        path: str,
+        num_workers: int,
+        *,
+        counter_names: typing.Sequence[str] = (),
+        significant_bits: int = 5,
+        highest_trackable_value: int = latency_histogram._DEFAULT_HIGHEST_TRACKABLE_NS
+    ) -> "SharedMetrics":
+        assert num_workers >= 1, "'num_workers' must be at least 1"
+        assert all(
+            name and name.isascii() and "," not in name for name in counter_names
+        ), "Counter names must be non empty ASCII strings without ','"
+        names = ",".join(counter_names).encode("ascii")
+        assert len(names) <= _COUNTER_NAMES_BYTES, "Counter names are too long"
+        num_buckets = len(
+            latency_histogram.LatencyHistogram(
+                significant_bits=significant_bits,
+                highest_trackable_value=highest_trackable_value,
+            )._counts
+        )
+        slot_words = _SLOT_HEADER_WORDS + len(counter_names) + num_buckets
+        header_bytes = _HEADER_WORDS * 8 + _COUNTER_NAMES_BYTES
+        size = header_bytes + num_workers * slot_words * 8
+        with open(path, "w+b") as backing_file:
+            backing_file.truncate(size)
+            mapping = mmap.mmap(backing_file.fileno(), size)
+        words = memoryview(mapping).cast("Q")
+        words[1] = _VERSION
+        words[2] = num_workers
+        words[3] = significant_bits
+        words[4] = highest_trackable_value
+        words[5] = num_buckets
+        words[6] = len(counter_names)
+        words[7] = slot_words
+        mapping[_HEADER_WORDS * 8 : _HEADER_WORDS * 8 + len(names)] = names
+        first_slot = header_bytes // 8
+        for worker_index in range(num_workers):
+            words[first_slot + worker_index * slot_words + _MIN] = _NO_MIN
+        # Published last, readers attaching before this fail instead of reading garbage
+        words[0] = _MAGIC
+        words.release()
+        return cls(path, mapping)
+
+    @classmethod
+    def attach(cls, path: str) -> "SharedMetrics":
+        with open(path, "r+b") as backing_file:
+            mapping = mmap.mmap(backing_file.fileno(), 0)
+        return cls(path, mapping)
+
+    def _slot_offset(self, worker_index: int) -> int:
+        assert (
+            0 <= worker_index < self.num_workers
+        ), "'worker_index' must be in [0, {})".format(self.num_workers)
+        header_words = _HEADER_WORDS + _COUNTER_NAMES_BYTES // 8
+        return header_words + worker_index * self._slot_words
+
+    def _make_histogram(self) -> latency_histogram.LatencyHistogram:
+        return latency_histogram.LatencyHistogram(
+            significant_bits=self._significant_bits,
+            highest_trackable_value=self._highest_trackable_value,
+        )
+
+    def recorder(self, worker_index: int) -> "SharedHistogramTimeRecorder":
+        return SharedHistogramTimeRecorder(self, worker_index)
+
+    def read_worker(self, worker_index: int) -> WorkerMetrics:
+        offset = self._slot_offset(worker_index)
+        words = self._words
+        histogram = self._make_histogram()
+        buckets_offset = offset + _SLOT_HEADER_WORDS + len(self.counter_names)
+        histogram._counts = array.array(
+            "Q", words[buckets_offset : buckets_offset + self._num_buckets].tobytes()
+        )
+        histogram.count = words[offset + _COUNT]
+        histogram.total = words[offset + _TOTAL]
+        if histogram.count:
+            histogram.min = words[offset + _MIN]
+            histogram.max = words[offset + _MAX]
+        counters = {
+            name: words[offset + _SLOT_HEADER_WORDS + index]
+            for index, name in enumerate(self.counter_names)
+        }
+        return WorkerMetrics(words[offset + _PID], histogram, counters)
+
+    def merged(self) -> WorkerMetrics:
+        histogram = self._make_histogram()
+        counters = dict.fromkeys(self.counter_names, 0)
+        for worker_index in range(self.num_workers):
+            worker = self.read_worker(worker_index)
+            histogram.merge(worker.histogram)
+            for name, value in worker.counters.items():
+                counters[name] += value
+        return WorkerMetrics(0, histogram, counters)
+
+    def close(self):
+        self._words.release()
+        self._mmap.close()
+
+    def unlink(self):
+        os.unlink(self.path)
+
+
+class SharedHistogramTimeRecorder:
+    # 'timed_event_loop.AbstractTimeRecorder' recording event durations (in ns) into
+    # the slot of 'worker_index' in 'SharedMetrics'. There must only be one recorder per
+    # slot.
+    def __init__(
+        self,
+        metrics: SharedMetrics,
+        worker_index: int,
+        clock: typing.Callable[[], int] = time.perf_counter_ns,
+    ):
+        self._offset = metrics._slot_offset(worker_index)
+        self._words = metrics._words
+        self._words[self._offset + _PID] = os.getpid()
+        self._counter_offsets = {
+            name: self._offset + _SLOT_HEADER_WORDS + index
+            for index, name in enumerate(metrics.counter_names)
+        }
+        self._buckets_offset = (
+            self._offset + _SLOT_HEADER_WORDS + len(metrics.counter_names)
+        )
+        # Only used for its bucket layout
+        self._layout = metrics._make_histogram()
+        self._clock = clock
+        self._curr_event_start = 0
+
+    def start_event(self):
+        self._curr_event_start = self._clock()
+
+    def end_event(self):
+        self.record(self._clock() - self._curr_event_start)
+
+    def record(self, value: int):
+        words = self._words
+        offset = self._offset
+        if value < 0:
+            value = 0
+        index = self._layout._index_of(value)
+        if index > self._layout._last_index:
+            index = self._layout._last_index
+        words[self._buckets_offset + index] += 1
+        words[offset + _COUNT] += 1
+        words[offset + _TOTAL] += value
+        if value > words[offset + _MAX]:
+            words[offset + _MAX] = value
+        if value < words[offset + _MIN]:
+            words[offset + _MIN] = value
+
+    def add(self, counter_name: str, value: int = 1):
+        self._words[self._counter_offsets[counter_name]] += value
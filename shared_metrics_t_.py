@@ -0,0 +1,97 @@
+import multiprocessing
+import os
+import pytest
+import shared_metrics
+import time
+import timed_event_loop
+
+
+def _worker(path, worker_index, values):
+    metrics = shared_metrics.SharedMetrics.attach(path)
+    try:
+        recorder = metrics.recorder(worker_index)
+        for value in values:
+            recorder.record(value)
+            recorder.add("events")
+        recorder.add("errors", worker_index)
+    finally:
+        metrics.close()
+
+
+def test_shared_metrics_across_processes(tmp_path):
+    path = str(tmp_path / "metrics")
+    metrics = shared_metrics.SharedMetrics.create(
+        path, 3, counter_names=("events", "errors")
+    )
+    try:
+        context = multiprocessing.get_context("spawn")
+        workers = [
+            context.Process(
+                target=_worker,
+                args=(
+                    path,
+                    worker_index,
+                    range(worker_index * 100, (worker_index + 1) * 100),
+                ),
+            )
+            for worker_index in range(2)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+            assert worker.exitcode == 0
+
+        first, second, unused = [
+            metrics.read_worker(worker_index) for worker_index in range(3)
+        ]
+        assert first.pid == workers[0].pid
+        assert first.histogram.count == 100
+        assert (first.histogram.min, first.histogram.max) == (0, 99)
+        assert second.counters == {"events": 100, "errors": 1}
+        assert unused.pid == 0
+        assert unused.histogram.count == 0
+        assert unused.histogram.min is None
+
+        merged = metrics.merged()
+        assert merged.histogram.count == 200
+        assert merged.histogram.total == sum(range(200))
+        assert (merged.histogram.min, merged.histogram.max) == (0, 199)
+        assert merged.counters == {"events": 200, "errors": 1}
+    finally:
+        metrics.close()
+        metrics.unlink()
+
+
+def test_shared_metrics_layout_errors(tmp_path):
+    path = str(tmp_path / "metrics")
+    with open(path, "wb") as backing_file:
+        backing_file.write(bytes(4096))
+    with pytest.raises(AssertionError, match="Not a shared metrics file"):
+        shared_metrics.SharedMetrics.attach(path)
+
+    metrics = shared_metrics.SharedMetrics.create(path, 1)
+    try:
+        with pytest.raises(AssertionError, match=r"'worker_index' must be in \[0, 1\)"):
+            metrics.recorder(1)
+    finally:
+        metrics.close()
+
+
+async def block_coro(block_duration):
+    time.sleep(block_duration)
+
+
+def test_shared_time_recorder(tmp_path):
+    metrics = shared_metrics.SharedMetrics.create(str(tmp_path / "metrics"), 1)
+    try:
+        loop = timed_event_loop.InlineTimedEventLoop(metrics.recorder(0))
+        try:
+            loop.run_until_complete(block_coro(0.01))
+        finally:
+            loop.close()
+        worker = metrics.read_worker(0)
+        assert worker.pid == os.getpid()
+        assert worker.histogram.max >= 10_000_000
+    finally:
+        metrics.close()
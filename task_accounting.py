@@ -0,0 +1,84 @@
+import asyncio
+import functools
+import heapq
+import time
+import typing
+import weakref
+
+
+class TaskUsage(typing.NamedTuple):
+    task: asyncio.Task
+    steps: int
+    # Wall clock and CPU time ('time.thread_time_ns' of the loop thread) in ns
+    wall: int
+    cpu: int
+
+
+def owning_task(handle: asyncio.Handle) -> typing.Optional[asyncio.Task]:
+    # The task a handle runs a step of, i.e. whose 'Task.__step'/'Task.__wakeup' is
+    # the callback, if any
+    callback = handle._callback
+    while isinstance(callback, functools.partial):
+        callback = callback.func
+    owner = getattr(callback, "__self__", None)
+    return owner if isinstance(owner, asyncio.Task) else None
+
+
+class TaskTimeRecorder:
+    # 'timed_event_loop.AbstractHandleTimeRecorder' accumulating the number of steps
+    # and the wall clock and CPU time spent running them per task. Tasks are weakly
+    # referenced, their totals go away with them. Handles not owned by a task are
+    # accounted in 'untracked'.
+    def __init__(
+        self,
+        clock: typing.Callable[[], int] = time.perf_counter_ns,
+        cpu_clock: typing.Callable[[], int] = time.thread_time_ns,
+    ):
+        self._clock = clock
+        self._cpu_clock = cpu_clock
+        # task -> [steps, wall, cpu]
+        self._usage: "weakref.WeakKeyDictionary[asyncio.Task, typing.List[int]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        # [steps, wall, cpu]
+        self.untracked = [0, 0, 0]
+        self._curr_event_start = 0
+        self._curr_event_cpu_start = 0
+
+    def start_handle(self, handle: asyncio.Handle):
+        self._curr_event_cpu_start = self._cpu_clock()
+        self._curr_event_start = self._clock()
+
+    def end_handle(self, handle: asyncio.Handle):
+        wall = self._clock() - self._curr_event_start
+        cpu = self._cpu_clock() - self._curr_event_cpu_start
+        task = owning_task(handle)
+        if task is None:
+            usage = self.untracked
+        else:
+            usage = self._usage.get(task)
+            if usage is None:
+                usage = self._usage[task] = [0, 0, 0]
+        usage[0] += 1
+        usage[1] += wall
+        usage[2] += cpu
+
+    def usage(self, task: asyncio.Task) -> TaskUsage:
+        return TaskUsage(task, *self._usage.get(task, (0, 0, 0)))
+
+    def top(self, count: int = 10, *, by: str = "cpu") -> typing.List[TaskUsage]:
+        # The 'count' tasks (still alive) with the most 'by' ("steps", "wall" or "cpu")
+        assert by in TaskUsage._fields[1:], "'by' must be one of {}".format(
+            TaskUsage._fields[1:]
+        )
+        index = TaskUsage._fields.index(by) - 1
+        return [
+            TaskUsage(task, *usage)
+            for task, usage in heapq.nlargest(
+                count, self._usage.items(), key=lambda item: item[1][index]
+            )
+        ]
+
+    def reset(self):
+        self._usage.clear()
+        self.untracked = [0, 0, 0]
@@ -0,0 +1,58 @@
+import asyncio
+import gc
+import pytest
+import task_accounting
+import time
+import timed_event_loop
+
+_DURATION = 0.05
+
+
+async def busy():
+    for _ in range(3):
+        end = time.thread_time() + _DURATION / 3
+        while time.thread_time() < end:
+            pass
+        await asyncio.sleep(0)
+
+
+async def blocked():
+    time.sleep(2 * _DURATION)
+
+
+def callback():
+    pass
+
+
+def test_task_time_recorder():
+    recorder = task_accounting.TaskTimeRecorder()
+
+    async def run_all():
+        busy_task = asyncio.create_task(busy(), name="busy")
+        blocked_task = asyncio.create_task(blocked(), name="blocked")
+        asyncio.get_running_loop().call_soon(callback)
+        await asyncio.gather(busy_task, blocked_task)
+        by_cpu = recorder.top(2)
+        by_wall = recorder.top(1, by="wall")
+        assert [usage.task for usage in by_cpu] == [busy_task, blocked_task]
+        assert [usage.task for usage in by_wall] == [blocked_task]
+        assert recorder.usage(busy_task).steps == 4
+        assert recorder.usage(busy_task).cpu >= _DURATION * 1e9
+        assert recorder.usage(blocked_task).wall >= 2 * _DURATION * 1e9
+        assert recorder.usage(blocked_task).cpu < _DURATION * 1e9 / 2
+
+    loop = timed_event_loop.HandleTimedEventLoop(recorder)
+    try:
+        loop.run_until_complete(run_all())
+    finally:
+        loop.close()
+    # 'callback' and the 'run_all' step resuming from 'gather'
+    assert recorder.untracked[0] >= 1
+    gc.collect()
+    # Only the 'run_all' task remains, referenced by 'run_until_complete'
+    assert len(recorder.top()) <= 1
+
+
+def test_top_by_error():
+    with pytest.raises(AssertionError, match="'by' must be one of"):
+        task_accounting.TaskTimeRecorder().top(by="task")
@@ -1,4 +1,6 @@
 import asyncio
+import asyncio_handle_intercept
+import functools
 import logging
 import timed_event_loop
 import time
@@ -21,20 +23,159 @@ class TimeRecorder(timed_event_loop.AbstractTimeRecorder):
         self._curr_event_start = None
 
 
+class NullTimeRecorder(timed_event_loop.AbstractTimeRecorder):
+    def start_event(self):
+        pass
+
+    def end_event(self):
+        pass
+
+
 async def block_coro(block_duration):
     time.sleep(block_duration)
 
 
 _STEP = 0.1
 
+_LOOP_FACTORIES = [
+    timed_event_loop.TimedEventLoop,
+    timed_event_loop.InlineTimedEventLoop,
+    timed_event_loop.SchedulingLagTimedEventLoop,
+]
 
+
+@pytest.mark.parametrize("loop_factory", _LOOP_FACTORIES)
 @pytest.mark.parametrize("block_duration", [(_STEP * i) for i in range(0, 10)])
-def test_timed_event_loop(block_duration):
+def test_timed_event_loop(block_duration, loop_factory):
     test_time_recorder = TimeRecorder()
-    timed_event_loop_policy = timed_event_loop.TimedEventLoopPolicy(
-        lambda: test_time_recorder
-    )
-    asyncio.set_event_loop_policy(timed_event_loop_policy)
-    asyncio.run(block_coro(block_duration))
+    # No global policy, which would leak into other tests
+    with asyncio.Runner(
+        loop_factory=functools.partial(loop_factory, test_time_recorder)
+    ) as runner:
+        runner.run(block_coro(block_duration))
     events = test_time_recorder.events
     assert block_duration + _STEP > max(events) >= block_duration
+
+
+@pytest.mark.parametrize("loop_factory", _LOOP_FACTORIES)
+def test_timed_event_loop_utilization(loop_factory):
+    loop = loop_factory(NullTimeRecorder(), track_utilization=True)
+    try:
+        loop.run_until_complete(block_coro(_STEP))
+        snapshot = loop.utilization.snapshot()
+    finally:
+        loop.close()
+    assert snapshot.iterations > 0
+    assert snapshot.busy >= _STEP * 1e9
+
+
+def test_inline_timed_event_loop_hook_raising():
+    class RaisingTimeRecorder(timed_event_loop.AbstractTimeRecorder):
+        def __init__(self, raise_on_start):
+            self._raise_on_start = raise_on_start
+            self.runs = 0
+
+        def start_event(self):
+            if self._raise_on_start:
+                raise RuntimeError("start_event")
+
+        def end_event(self):
+            raise RuntimeError("end_event")
+
+    async def count_coro(recorder):
+        recorder.runs += 1
+        await asyncio.sleep(0)
+        recorder.runs += 1
+
+    for raise_on_start in (True, False):
+        recorder = RaisingTimeRecorder(raise_on_start)
+        loop = timed_event_loop.InlineTimedEventLoop(recorder)
+        try:
+            loop.run_until_complete(count_coro(recorder))
+        finally:
+            loop.close()
+        assert recorder.runs == 2
+
+
+def _run_callbacks(loop: asyncio.AbstractEventLoop, rounds: int) -> float:
+    async def run():
+        remaining = rounds
+        done = loop.create_future()
+
+        def callback():
+            nonlocal remaining
+            remaining -= 1
+            if remaining:
+                loop.call_soon(callback)
+            else:
+                done.set_result(None)
+
+        loop.call_soon(callback)
+        await done
+
+    try:
+        start = time.perf_counter()
+        loop.run_until_complete(run())
+        return time.perf_counter() - start
+    finally:
+        loop.close()
+
+
+def test_timed_event_loop_perf():
+    ROUNDS = 100_000
+    logging.info(
+        "Time running %s callbacks on plain loop: %s (s)",
+        ROUNDS,
+        _run_callbacks(asyncio.DefaultEventLoopPolicy._loop_factory(), ROUNDS),
+    )
+    for loop_factory in _LOOP_FACTORIES:
+        logging.info(
+            "Time running %s callbacks on %s: %s (s)",
+            ROUNDS,
+            loop_factory.__name__,
+            _run_callbacks(loop_factory(NullTimeRecorder()), ROUNDS),
+        )
+
+
+def test_scheduling_lag_timed_event_loop():
+    BLOCK_DURATION = 0.1
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        done = loop.create_future()
+        loop.call_soon(time.sleep, BLOCK_DURATION)
+        # Waits behind the blocking callback in '_ready'
+        loop.call_soon(lambda: None)
+        # Due while the loop is blocked
+        loop.call_later(BLOCK_DURATION / 10, done.set_result, None)
+        await done
+
+    loop = timed_event_loop.SchedulingLagTimedEventLoop(NullTimeRecorder())
+    try:
+        loop.run_until_complete(run())
+    finally:
+        loop.close()
+    assert loop.ready_wait.count >= 3
+    assert loop.ready_wait.max >= BLOCK_DURATION * 1e9
+    assert loop.timer_lateness.count == 1
+    assert loop.timer_lateness.max >= BLOCK_DURATION * 0.9 * 1e9
+
+
+def test_sampled_timed_event_loop():
+    class CountingTimeRecorder(timed_event_loop.AbstractTimeRecorder):
+        def __init__(self):
+            self.events = 0
+
+        def start_event(self):
+            self.events += 1
+
+        def end_event(self):
+            pass
+
+    recorder = CountingTimeRecorder()
+    loop = timed_event_loop.TimedEventLoop(
+        recorder,
+        sampler=asyncio_handle_intercept.EveryNthSampler(10),
+    )
+    _run_callbacks(loop, 1000)
+    assert 90 <= recorder.events <= 110
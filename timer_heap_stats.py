@@ -0,0 +1,71 @@
+import asyncio
+import time
+import typing
+
+
+class TimerHeapStats:
+    # Counters about the '_scheduled' timer heap of a loop. 'heap_size' and
+    # 'cancelled_in_heap' are as of the last cleanup (i.e. the start of the last loop
+    # iteration), 'peak_heap_size' is the largest size seen before a cleanup, everything
+    # else is cumulative.
+    def __init__(self):
+        # Timers in the heap, including cancelled ones not removed yet
+        self.heap_size = 0
+        self.peak_heap_size = 0
+        # Cancelled timers still in the heap
+        self.cancelled_in_heap = 0
+        # Timers cancelled while in the heap
+        self.cancelled = 0
+        # Heap rebuilds, when too big a fraction of it was cancelled
+        self.rebuilds = 0
+        # Cancelled timers removed by rebuilds, and popped from the head of the heap
+        self.rebuild_removed = 0
+        self.head_removed = 0
+        # Timers popped from the heap because they were due
+        self.fired = 0
+        # Time (ns) spent removing cancelled timers, and popping due timers
+        self.cleanup_ns = 0
+        self.pop_due_ns = 0
+
+
+class TimerHeapStatsMixin:
+    # Records 'TimerHeapStats' for a 'run_once_loop.RunOnceEventLoop' subclass, e.g.:
+    #   class Loop(TimerHeapStatsMixin, timed_event_loop.TimedEventLoop): ...
+    def __init__(
+        self, *args, timer_heap_stats: typing.Optional[TimerHeapStats] = None, **kwargs
+    ):
+        super().__init__(*args, **kwargs)
+        self.timer_heap_stats = (
+            TimerHeapStats() if timer_heap_stats is None else timer_heap_stats
+        )
+
+    def _timer_handle_cancelled(self, handle: asyncio.TimerHandle):
+        super()._timer_handle_cancelled(handle)
+        if handle._scheduled:
+            self.timer_heap_stats.cancelled += 1
+
+    def _clean_scheduled(self):
+        stats = self.timer_heap_stats
+        scheduled = self._scheduled
+        size = len(scheduled)
+        if size > stats.peak_heap_size:
+            stats.peak_heap_size = size
+        start = time.perf_counter_ns()
+        super()._clean_scheduled()
+        stats.cleanup_ns += time.perf_counter_ns() - start
+        removed = size - len(self._scheduled)
+        if self._scheduled is not scheduled:
+            stats.rebuilds += 1
+            stats.rebuild_removed += removed
+        else:
+            stats.head_removed += removed
+        stats.heap_size = len(self._scheduled)
+        stats.cancelled_in_heap = self._timer_cancelled_count
+
+    def _schedule_due_timers(self) -> int:
+        start = time.perf_counter_ns()
+        count = super()._schedule_due_timers()
+        stats = self.timer_heap_stats
+        stats.pop_due_ns += time.perf_counter_ns() - start
+        stats.fired += count
+        return count
@@ -0,0 +1,54 @@
+import asyncio
+import timed_event_loop
+import timer_heap_stats
+
+
+class _NullTimeRecorder(timed_event_loop.AbstractTimeRecorder):
+    def start_event(self):
+        pass
+
+    def end_event(self):
+        pass
+
+
+class _TimerHeapStatsLoop(
+    timer_heap_stats.TimerHeapStatsMixin, timed_event_loop.TimedEventLoop
+):
+    pass
+
+
+def callback():
+    pass
+
+
+async def schedule_timers():
+    loop = asyncio.get_running_loop()
+    handles = [loop.call_later(60 + i, callback) for i in range(1000)]
+    for handle in handles[:900]:
+        handle.cancel()
+    loop.call_later(0, callback)
+    loop.call_later(0, callback).cancel()
+    await asyncio.sleep(0.01)
+    for handle in handles[900:]:
+        handle.cancel()
+
+
+def test_timer_heap_stats():
+    loop = _TimerHeapStatsLoop(_NullTimeRecorder())
+    try:
+        loop.run_until_complete(schedule_timers())
+        loop.run_until_complete(asyncio.sleep(0))
+    finally:
+        loop.close()
+    stats = loop.timer_heap_stats
+    assert stats.cancelled == 1001
+    assert stats.peak_heap_size >= 1002
+    assert stats.rebuilds == 1
+    assert stats.rebuild_removed == 901
+    # Too few left for a rebuild
+    assert stats.head_removed == 100
+    # 'call_later(0)' and the timer of 'asyncio.sleep(0.01)'
+    assert stats.fired == 2
+    assert stats.heap_size == stats.cancelled_in_heap == 0
+    assert stats.cleanup_ns > 0
+    assert stats.pop_due_ns > 0
@@ -0,0 +1,98 @@
+import collections
+import time
+import typing
+
+_T = typing.TypeVar("_T")
+
+
+PopInterceptor = typing.Callable[[_T, float], None]
+
+
+class TimestampedDeque(collections.deque):
+    # Deque remembering when each of its items was pushed, 'pop_interceptor' is called
+    # with every popped item and its push time.
+    # Items added through 'extend', 'insert', '__setitem__'... are timestamped too,
+    # removed ones ('remove', '__delitem__', 'clear') are not intercepted.
+    # NOTE: push times live in a parallel deque, concurrent pushes from different
+    # threads (e.g. 'call_soon_threadsafe') may swap the push times of the items
+    # involved.
+    def __init__(
+        self,
+        iterable: typing.Optional[typing.Iterable[_T]] = None,
+        maxlen: typing.Optional[int] = None,
+        clock: typing.Callable[[], float] = time.monotonic,
+        pop_interceptor: typing.Optional[PopInterceptor] = None,
+    ):
+        iterable = [] if iterable is None else iterable
+        super().__init__(iterable, maxlen)
+        assert pop_interceptor is not None, "'pop_interceptor' must be specified"
+        self._clock = clock
+        self._pop_interceptor = pop_interceptor
+        now = clock()
+        self._push_times = collections.deque((now for _ in self), maxlen)
+
+    def pop(self) -> _T:
+        ret = super().pop()
+        self._pop_interceptor(ret, self._push_times.pop())
+        return ret
+
+    def popleft(self) -> _T:
+        ret = super().popleft()
+        self._pop_interceptor(ret, self._push_times.popleft())
+        return ret
+
+    def append(self, x: _T):
+        self._push_times.append(self._clock())
+        super().append(x)
+
+    def appendleft(self, x: _T):
+        self._push_times.appendleft(self._clock())
+        super().appendleft(x)
+
+    def clear(self):
+        super().clear()
+        self._push_times.clear()
+
+    def rotate(self, n: int = 1):
+        super().rotate(n)
+        self._push_times.rotate(n)
+
+    def extend(self, iterable: typing.Iterable[_T]):
+        items = list(iterable)
+        now = self._clock()
+        super().extend(items)
+        self._push_times.extend(now for _ in items)
+
+    def extendleft(self, iterable: typing.Iterable[_T]):
+        items = list(iterable)
+        now = self._clock()
+        super().extendleft(items)
+        self._push_times.extendleft(now for _ in items)
+
+    def insert(self, i: int, x: _T):
+        super().insert(i, x)
+        self._push_times.insert(i, self._clock())
+
+    def remove(self, value: _T):
+        del self[self.index(value)]
+
+    def reverse(self):
+        super().reverse()
+        self._push_times.reverse()
+
+    def __setitem__(self, __index: typing.SupportsIndex, value: _T):  # type: ignore
+        super().__setitem__(__index, value)
+        self._push_times[__index] = self._clock()
+
+    def __delitem__(self, __index: typing.SupportsIndex):  # type: ignore
+        super().__delitem__(__index)
+        del self._push_times[__index]
+
+    def __iadd__(self, iterable: typing.Iterable[_T]) -> "TimestampedDeque":
+        self.extend(iterable)
+        return self
+
+    def __imul__(self, n: int) -> "TimestampedDeque":
+        super().__imul__(n)
+        self._push_times *= n
+        return self
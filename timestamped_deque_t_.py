@@ -0,0 +1,113 @@
+import timestamped_deque
+import collections
+import pytest
+
+
+def make_std_deque(iterable, maxlen):
+    iterable = [] if iterable is None else iterable
+    return collections.deque(iterable, maxlen)
+
+
+def test_no_interceptor_is_error():
+    with pytest.raises(AssertionError, match="'pop_interceptor' must be specified"):
+        timestamped_deque.TimestampedDeque()
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        self.now += 1
+        return self.now
+
+
+@pytest.mark.parametrize(
+    "starting_iterable,maxlen",
+    (
+        (None, None),
+        ([], None),
+        ([], 1),
+        ([1, 2, 3, 4, 5], None),
+        ([1, 2, 3, 4, 5], 3),
+    ),
+)
+def test_push_times(starting_iterable, maxlen):
+    clock = _Clock()
+    popped = []
+    t_deque = timestamped_deque.TimestampedDeque(
+        starting_iterable,
+        maxlen,
+        clock=clock,
+        pop_interceptor=lambda item, push_time: popped.append((item, push_time)),
+    )
+    deque = make_std_deque(starting_iterable, maxlen)
+    # Items of the starting iterable are all pushed at construction
+    push_times = make_std_deque([clock.now] * len(deque), maxlen)
+    assert t_deque == deque
+    for x in (6, 7):
+        t_deque.append(x)
+        deque.append(x)
+        push_times.append(clock.now)
+    t_deque.appendleft(0)
+    deque.appendleft(0)
+    push_times.appendleft(clock.now)
+    assert t_deque == deque
+    t_deque.rotate(2)
+    deque.rotate(2)
+    push_times.rotate(2)
+    assert t_deque == deque
+
+    assert t_deque.pop() == deque.pop()
+    assert popped[-1][1] == push_times.pop()
+    for _ in range(len(deque)):
+        assert t_deque.popleft() == deque.popleft()
+        assert popped[-1][1] == push_times.popleft()
+    assert t_deque == deque
+
+    t_deque.append(1)
+    t_deque.clear()
+    t_deque.append(2)
+    assert t_deque.popleft() == 2
+    assert popped[-1] == (2, clock.now)
+
+
+@pytest.mark.parametrize("maxlen", (None, 4))
+def test_other_mutations(maxlen):
+    clock = _Clock()
+    popped = []
+    t_deque = timestamped_deque.TimestampedDeque(
+        maxlen=maxlen,
+        clock=clock,
+        pop_interceptor=lambda item, push_time: popped.append((item, push_time)),
+    )
+    deque = make_std_deque(None, maxlen)
+    push_times = make_std_deque(None, maxlen)
+
+    def check(mutate, new_push_times):
+        mutate(t_deque)
+        mutate(deque)
+        new_push_times(push_times)
+        assert t_deque == deque
+        assert t_deque._push_times == push_times
+
+    def iadd(d):
+        d += [5, 6]
+
+    def imul(d):
+        d *= 2
+
+    check(lambda d: d.extend([1, 2]), lambda p: p.extend([clock.now] * 2))
+    check(lambda d: d.extendleft([3, 4]), lambda p: p.extendleft([clock.now] * 2))
+    index = deque.index(2)
+    check(lambda d: d.remove(2), lambda p: p.__delitem__(index))
+    check(lambda d: d.__delitem__(0), lambda p: p.__delitem__(0))
+    check(lambda d: d.insert(1, 7), lambda p: p.insert(1, clock.now))
+    check(iadd, lambda p: p.extend([clock.now] * 2))
+    check(lambda d: d.__setitem__(-1, 8), lambda p: p.__setitem__(-1, clock.now))
+    check(lambda d: d.reverse(), lambda p: p.reverse())
+    check(imul, lambda p: p.__imul__(2))
+    while deque:
+        assert t_deque.popleft() == deque.popleft()
+        assert popped[-1][1] == push_times.popleft()
+    assert not t_deque._push_times
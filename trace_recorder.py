@@ -0,0 +1,129 @@
+import asyncio
+import callsite_registry
+import json
+import os
+import threading
+import time
+import typing
+import weakref
+
+_DEFAULT_BUFFER_SIZE = 1 << 20
+# separator, name prefix, ts, dur, pid, tid, task, args suffix
+_EVENT_FORMAT = '{}{}"ts":{:.3f},"dur":{:.3f},"pid":{},"tid":{},"args":{{"task":{}{}'
+
+
+class TraceEventRecorder:
+    # 'timed_event_loop.AbstractHandleTimeRecorder' streaming every handle run as a
+    # Trace Event Format complete ("X") event, loadable in Perfetto/chrome://tracing.
+    # The file is written through a 'buffer_size' buffer. When 'max_bytes' is given,
+    # the file is rotated once it grows past it, the same way as
+    # 'logging.handlers.RotatingFileHandler': 'path' is renamed to 'path.1', 'path.1' to
+    # 'path.2', ... up to 'backup_count' files.
+    def __init__(
+        self,
+        path: str,
+        *,
+        max_bytes: typing.Optional[int] = None,
+        backup_count: int = 1,
+        buffer_size: int = _DEFAULT_BUFFER_SIZE,
+        resolver: typing.Optional[callsite_registry.CallSiteResolver] = None
+    ):
+        assert max_bytes is None or max_bytes > 0, "'max_bytes' must be positive"
+        assert backup_count >= 1, "'backup_count' must be at least 1"
+        self._path = path
+        self._max_bytes = max_bytes
+        self._backup_count = backup_count
+        self._buffer_size = buffer_size
+        self._resolver = (
+            callsite_registry.CallSiteResolver() if resolver is None else resolver
+        )
+        # call site -> (event prefix, args suffix), already JSON encoded
+        self._fragments: typing.Dict[
+            callsite_registry.CallSite, typing.Tuple[str, str]
+        ] = {}
+        self._pid = os.getpid()
+        # Of the loop thread, known from the first event on
+        self._tid: typing.Optional[int] = None
+        # task -> (name, JSON encoded name), re-encoded when the task is renamed
+        self._task_names: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._curr_event_start = 0
+        self._file: typing.Optional[typing.TextIO] = None
+        self._open()
+
+    def _open(self):
+        self._file = open(self._path, "w", buffering=self._buffer_size)
+        self._file.write("[")
+        self._written = 1
+        self._separator = "\n"
+
+    def _close_file(self):
+        self._file.write("\n]\n")
+        self._file.close()
+        self._file = None
+
+    def _rotate(self):
+        self._close_file()
+        for index in range(self._backup_count - 1, 0, -1):
+            source = "{}.{}".format(self._path, index)
+            if os.path.exists(source):
+                os.replace(source, "{}.{}".format(self._path, index + 1))
+        os.replace(self._path, self._path + ".1")
+        self._open()
+
+    def _make_fragments(
+        self, call_site: callsite_registry.CallSite
+    ) -> typing.Tuple[str, str]:
+        prefix = '{{"name":{},"cat":"asyncio","ph":"X",'.format(
+            json.dumps(call_site.name)
+        )
+        suffix = ',"file":{},"line":{}}}}}'.format(
+            json.dumps(call_site.filename), call_site.lineno
+        )
+        return prefix, suffix
+
+    def _task_name(self, task: typing.Optional[asyncio.Task]) -> str:
+        if task is None:
+            return "null"
+        name = task.get_name()
+        cached = self._task_names.get(task)
+        if cached is None or cached[0] is not name:
+            cached = self._task_names[task] = (name, json.dumps(name))
+        return cached[1]
+
+    def start_handle(self, handle: asyncio.Handle):
+        self._curr_event_start = time.perf_counter_ns()
+
+    def end_handle(self, handle: asyncio.Handle):
+        end = time.perf_counter_ns()
+        start = self._curr_event_start
+        if self._file is None:
+            return
+        call_site, task = self._resolver.resolve(handle)
+        if self._tid is None:
+            self._tid = threading.get_native_id()
+        fragments = self._fragments.get(call_site)
+        if fragments is None:
+            fragments = self._fragments[call_site] = self._make_fragments(call_site)
+        event = _EVENT_FORMAT.format(
+            self._separator,
+            fragments[0],
+            start / 1000,
+            (end - start) / 1000,
+            self._pid,
+            self._tid,
+            self._task_name(task),
+            fragments[1],
+        )
+        self._separator = ",\n"
+        self._file.write(event)
+        self._written += len(event)
+        if self._max_bytes is not None and self._written >= self._max_bytes:
+            self._rotate()
+
+    def flush(self):
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._close_file()
@@ -0,0 +1,86 @@
+import asyncio
+import json
+import os
+import threading
+import time
+import timed_event_loop
+import trace_recorder
+
+
+async def block_coro(block_duration):
+    time.sleep(block_duration)
+
+
+def _run_traced(recorder, rounds=1):
+    async def run():
+        for i in range(rounds):
+            await asyncio.create_task(block_coro(0.001), name="block-{}".format(i))
+
+    loop = timed_event_loop.HandleTimedEventLoop(recorder)
+    try:
+        loop.run_until_complete(run())
+    finally:
+        loop.close()
+        recorder.close()
+
+
+def test_trace_event_recorder(tmp_path):
+    path = str(tmp_path / "trace.json")
+    _run_traced(trace_recorder.TraceEventRecorder(path))
+    with open(path) as trace:
+        events = json.load(trace)
+    (block_event,) = [event for event in events if event["name"] == "block_coro"]
+    assert block_event["ph"] == "X"
+    assert block_event["dur"] >= 1000
+    assert block_event["pid"] == os.getpid()
+    assert block_event["tid"] == threading.get_native_id()
+    assert block_event["args"]["task"] == "block-0"
+    assert block_event["args"]["file"] == __file__
+    assert all(event["dur"] >= 0 for event in events)
+
+
+def test_trace_event_recorder_rotation(tmp_path):
+    path = str(tmp_path / "trace.json")
+    _run_traced(
+        trace_recorder.TraceEventRecorder(path, max_bytes=1024, backup_count=2),
+        rounds=50,
+    )
+    assert sorted(os.listdir(tmp_path)) == [
+        "trace.json",
+        "trace.json.1",
+        "trace.json.2",
+    ]
+    for name in os.listdir(tmp_path):
+        with open(str(tmp_path / name)) as trace:
+            assert isinstance(json.load(trace), list)
+    with open(path + ".1") as trace:
+        names = {event["args"]["task"] for event in json.load(trace)}
+    assert "block-0" not in names
+
+
+def test_task_names_follow_renames(tmp_path):
+    path = str(tmp_path / "trace.json")
+
+    async def renamed():
+        await asyncio.sleep(0)
+        asyncio.current_task().set_name('after "rename"')
+        await asyncio.sleep(0)
+
+    async def run():
+        await asyncio.create_task(renamed(), name="before")
+
+    recorder = trace_recorder.TraceEventRecorder(path)
+    loop = timed_event_loop.HandleTimedEventLoop(recorder)
+    try:
+        loop.run_until_complete(run())
+    finally:
+        loop.close()
+        recorder.close()
+    with open(path) as trace:
+        names = [
+            event["args"]["task"]
+            for event in json.load(trace)
+            if event["name"].endswith(".renamed")
+        ]
+    # Names are read once the step ran
+    assert names == ["before"] + ['after "rename"'] * 2